@@ -0,0 +1,242 @@
+import frappe
+from frappe.utils import add_days, cint, now_datetime, nowdate
+
+from quantbit_pro_work_management.portal import clear_applicant_documents_cache
+
+ARCHIVE_BATCH_SIZE = 500
+CLOSED_STATUSES = ("Expired", "Renewed", "Extended", "Cancelled")
+ARCHIVE_FIELDS = [
+    "applicant",
+    "applicant_full_name",
+    "document_category",
+    "document_type",
+    "transaction_type",
+    "posting_date",
+    "issue_date",
+    "effective_expiry_date",
+    "status",
+    "root_document",
+    "chain_depth",
+]
+ARCHIVED_SUPPORTING_DOCUMENT_FIELDS = [
+    "document_type",
+    "verified",
+    "attachment",
+    "issue_date",
+    "expiry_date",
+    "remarks",
+    "content_hash",
+    "file_size",
+    "page_count",
+]
+
+
+def enqueue_archive():
+    """Scheduler: start the archive job when archiving is enabled in Pro Work Settings."""
+    if not frappe.db.get_single_value("Pro Work Settings", "enable_archiving"):
+        return
+    frappe.enqueue(
+        "quantbit_pro_work_management.archive.archive_closed_applications",
+        queue="long",
+        timeout=4 * 60 * 60,
+        job_id="document_application_archive",
+        deduplicate=True,
+    )
+
+
+def archive_closed_applications(batch_size=ARCHIVE_BATCH_SIZE):
+    """Move old closed applications to Document Application Archive, one committed batch at a time.
+
+    Renewal / extension chains are archived whole, once every document in
+    the chain is closed and the newest is past the cutoff, so live documents
+    never link to an archived one. Returns the number of archived applications.
+    """
+    archive_after_days = cint(frappe.db.get_single_value("Pro Work Settings", "archive_after_days")) or 730
+    cutoff = add_days(nowdate(), -archive_after_days)
+    archived = 0
+    for chains in get_archivable_chains(cutoff, batch_size):
+        names = get_chain_members(chains)
+        if names:
+            archive_applications(names)
+            frappe.db.commit()
+            archived += len(names)
+    return archived
+
+
+def get_archivable_chains(cutoff, batch_size):
+    """Yield batches of chain roots whose documents are all closed and posted before `cutoff`.
+
+    Chains are read in root order by seeking on the root_document index, and
+    each batch is checked on the same index, so a batch costs the size of its
+    chains rather than a pass over the table. Cancelled documents that never
+    joined a chain count as chains of their own.
+    """
+    last_root = ""
+    while roots := frappe.db.sql_list(
+        """
+        SELECT DISTINCT root_document
+        FROM `tabDocument Application`
+        WHERE root_document > %(after)s
+        ORDER BY root_document
+        LIMIT %(limit)s
+        """,
+        {"after": last_root, "limit": batch_size},
+    ):
+        last_root = roots[-1]
+        chains = frappe.db.sql_list(
+            """
+            SELECT root_document
+            FROM `tabDocument Application`
+            WHERE root_document IN %(roots)s
+            GROUP BY root_document
+            HAVING MAX(posting_date) < %(cutoff)s
+                AND SUM(docstatus = 2 OR (docstatus = 1 AND status IN %(statuses)s)) = COUNT(*)
+            """,
+            {"roots": roots, "cutoff": cutoff, "statuses": CLOSED_STATUSES},
+        )
+        if chains:
+            yield chains
+
+    last_name = ""
+    while chains := frappe.db.sql_list(
+        """
+        SELECT name
+        FROM `tabDocument Application`
+        WHERE root_document IS NULL
+            AND docstatus = 2
+            AND posting_date < %(cutoff)s
+            AND name > %(after)s
+        ORDER BY name
+        LIMIT %(limit)s
+        """,
+        {"cutoff": cutoff, "after": last_name, "limit": batch_size},
+    ):
+        last_name = chains[-1]
+        yield chains
+
+
+def get_chain_members(chains):
+    """Documents of `chains`, less the chains a document outside them still renews, extends or amends."""
+    members = {
+        row.name: row.chain
+        for row in frappe.db.sql(
+            """
+            SELECT name, IFNULL(root_document, name) AS chain
+            FROM `tabDocument Application`
+            WHERE root_document IN %(chains)s OR name IN %(chains)s
+            """,
+            {"chains": chains},
+            as_dict=True,
+        )
+        if row.chain in chains
+    }
+    if not members:
+        return []
+    referenced = frappe.db.sql(
+        """
+        SELECT previous_document, previous_referred_document, amended_from
+        FROM `tabDocument Application`
+        WHERE (previous_document IN %(names)s
+                OR previous_referred_document IN %(names)s
+                OR amended_from IN %(names)s)
+            AND name NOT IN %(names)s
+        """,
+        {"names": list(members)},
+    )
+    blocked = {members[name] for row in referenced for name in row if name in members}
+    return [name for name, chain in members.items() if chain not in blocked]
+
+
+def archive_applications(names):
+    """Copy the applications and their supporting documents to the archive, then delete them.
+
+    Set-based on purpose: the delete skips on_trash, so the monthly rollup keeps
+    counting archived applications (rebuild_rollup reads the archive too). The
+    dependents on_trash would have handled are dealt with here: reminder ledger
+    rows are deleted, supporting document rows move to Archived Supporting
+    Document so the live child table only holds live rows, and Versions, name
+    search tokens and attached Files move to the archive record, which keeps
+    the audit trail and still searches them.
+    """
+    documents = frappe.get_all("Document Application", filters={"name": ["in", names]}, fields=["*"])
+    supporting_documents = {}
+    for row in frappe.get_all(
+        "Supporting Document",
+        filters={"parenttype": "Document Application", "parent": ["in", names]},
+        fields=["*"],
+        order_by="idx",
+    ):
+        supporting_documents.setdefault(row.parent, []).append(row)
+
+    timestamp = now_datetime()
+    user = frappe.session.user
+    values = []
+    for doc in documents:
+        data = dict(doc, supporting_document=supporting_documents.get(doc.name, []))
+        values.append((
+            doc.name, doc.creation, timestamp, doc.owner, user,
+            *(doc.get(fieldname) for fieldname in ARCHIVE_FIELDS),
+            doc.docstatus, timestamp, frappe.as_json(data),
+        ))
+    frappe.db.bulk_insert(
+        "Document Application Archive",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            *ARCHIVE_FIELDS,
+            "original_docstatus", "archived_on", "data",
+        ],
+        values,
+        ignore_duplicates=True,
+    )
+    # attachments.remove_unreferenced_file reads the archived rows, so their files are kept
+    frappe.db.bulk_insert(
+        "Archived Supporting Document",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            "parent", "parenttype", "parentfield", "idx",
+            *ARCHIVED_SUPPORTING_DOCUMENT_FIELDS,
+        ],
+        [
+            (
+                row.name, row.creation, timestamp, row.owner, user,
+                row.parent, "Document Application Archive", "supporting_document", row.idx,
+                *(row.get(fieldname) for fieldname in ARCHIVED_SUPPORTING_DOCUMENT_FIELDS),
+            )
+            for rows in supporting_documents.values()
+            for row in rows
+        ],
+        ignore_duplicates=True,
+    )
+    frappe.db.delete("Supporting Document", {"parenttype": "Document Application", "parent": ["in", names]})
+    frappe.db.delete("Document Reminder Ledger", {"document_application": ["in", names]})
+    move_to_archive(names)
+    frappe.db.delete("Document Application", {"name": ["in", names]})
+    clear_applicant_documents_cache([doc.applicant for doc in documents])
+
+
+def move_to_archive(names):
+    """Point the Versions, name search tokens and attached Files of archived applications at the archive."""
+    frappe.db.sql(
+        """
+        UPDATE `tabVersion`
+        SET ref_doctype = 'Document Application Archive'
+        WHERE ref_doctype = 'Document Application' AND docname IN %(names)s
+        """,
+        {"names": names},
+    )
+    frappe.db.sql(
+        """
+        UPDATE `tabName Search Token`
+        SET reference_doctype = 'Document Application Archive'
+        WHERE reference_doctype = 'Document Application' AND reference_name IN %(names)s
+        """,
+        {"names": names},
+    )
+    frappe.db.sql(
+        """
+        UPDATE `tabFile`
+        SET attached_to_doctype = 'Document Application Archive'
+        WHERE attached_to_doctype = 'Document Application' AND attached_to_name IN %(names)s
+        """,
+        {"names": names},
+    )
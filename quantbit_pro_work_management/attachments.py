@@ -0,0 +1,189 @@
+import hashlib
+import io
+import os
+
+import frappe
+from frappe.utils import now_datetime
+
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "gif", "webp")
+METADATA_FIELDS = ("content_hash", "file_size", "page_count", "thumbnail")
+
+
+def on_document_application_validate(doc, method=None):
+    """doc_events handler: mark new or replaced attachments for background processing."""
+    previous = doc.get_doc_before_save()
+    previous_attachments = (
+        {row.name: row.attachment for row in previous.supporting_document} if previous else {}
+    )
+    for row in doc.supporting_document:
+        if not row.attachment:
+            row.attachment_status = None
+        elif previous_attachments.get(row.name) != row.attachment or not row.attachment_status:
+            row.attachment_status = "Pending"
+            for fieldname in METADATA_FIELDS:
+                row.set(fieldname, None)
+
+
+def on_document_application_update(doc, method=None):
+    """doc_events handler: hand pending attachments to a worker once the save commits."""
+    if not any(row.attachment_status == "Pending" for row in doc.supporting_document):
+        return
+    enqueue_attachment_processing(doc.name, enqueue_after_commit=True)
+
+
+def enqueue_attachment_processing(application, enqueue_after_commit=False):
+    # one job per application; a save while it is queued or running is picked up by the same job
+    frappe.enqueue(
+        "quantbit_pro_work_management.attachments.process_pending_attachments",
+        queue="short",
+        job_id=f"supporting_document_attachments::{application}",
+        deduplicate=True,
+        enqueue_after_commit=enqueue_after_commit,
+        application=application,
+    )
+
+
+def enqueue_pending_attachments():
+    """Scheduler: sweep up Pending rows whose job was skipped, e.g. saved just as it finished."""
+    for application in get_applications_with_pending_attachments():
+        enqueue_attachment_processing(application)
+
+
+def get_applications_with_pending_attachments():
+    return frappe.get_all(
+        "Supporting Document",
+        filters={"parenttype": "Document Application", "attachment_status": "Pending"},
+        pluck="parent",
+        distinct=True,
+    )
+
+
+def process_pending_attachments(application):
+    """Process Pending rows until none are left, so rows saved while the job runs are included."""
+    while rows := get_pending_attachments(application):
+        for row in rows:
+            process_pending_attachment(application, row)
+
+
+def get_pending_attachments(application):
+    return frappe.get_all(
+        "Supporting Document",
+        filters={
+            "parenttype": "Document Application",
+            "parent": application,
+            "attachment_status": "Pending",
+        },
+        fields=["name", "attachment"],
+    )
+
+
+def process_pending_attachment(application, row):
+    try:
+        values = process_attachment(application, row.attachment)
+        values["attachment_status"] = "Processed"
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(
+            f"Supporting Document attachment {row.attachment}",
+            reference_doctype="Document Application",
+            reference_name=application,
+        )
+        values = {"attachment_status": "Failed"}
+    frappe.db.set_value("Supporting Document", row.name, values, update_modified=False)
+    if values.get("attachment", row.attachment) != row.attachment:
+        # a form loaded before the rewrite still holds the removed copy's URL; its save must fail
+        frappe.db.set_value(
+            "Document Application", application, "modified", now_datetime(), update_modified=False
+        )
+    frappe.db.commit()
+
+
+def process_all_pending_attachments():
+    """Long job working through every application with pending attachments, e.g. after install."""
+    for application in get_applications_with_pending_attachments():
+        process_pending_attachments(application)
+
+
+def process_attachment(application, file_url):
+    """Hash, dedupe and describe one attached file.
+
+    Identical content already stored under another URL is shared: this row and
+    its File are repointed to the existing URL, and the duplicate copy is removed
+    from disk once that is committed. Only a File attached to this application
+    is repointed, and process_pending_attachment bumps the application's
+    modified so a stale form cannot save the old URL back.
+    """
+    file = get_attachment_file(application, file_url)
+    # a File attached elsewhere that only shares the URL is read, never repointed
+    attached = file.attached_to_doctype == "Document Application" and file.attached_to_name == application
+    content = file.get_content()
+    if isinstance(content, str):
+        content = content.encode()
+    content_hash = file.content_hash or hashlib.md5(content).hexdigest()
+    values = {"content_hash": content_hash, "file_size": len(content), "attachment": file_url}
+
+    canonical_url = attached and frappe.db.get_value(
+        "File",
+        {
+            "content_hash": content_hash,
+            "is_private": file.is_private,
+            "file_url": ["!=", file_url],
+            "is_folder": 0,
+        },
+        "file_url",
+        order_by="creation asc",
+    )
+    if canonical_url:
+        duplicate_path = file.get_full_path()
+        frappe.db.set_value(
+            "File",
+            file.name,
+            {"file_url": canonical_url, "content_hash": content_hash},
+            update_modified=False,
+        )
+        # a rollback drops the callback, so the File is never left pointing at a removed copy
+        frappe.db.after_commit.add(lambda: remove_unreferenced_file(file_url, duplicate_path))
+        values["attachment"] = canonical_url
+        file.file_url = canonical_url
+    elif attached and not file.content_hash:
+        frappe.db.set_value("File", file.name, "content_hash", content_hash, update_modified=False)
+
+    extension = (file.file_name or file_url).rsplit(".", 1)[-1].lower()
+    if extension == "pdf":
+        values["page_count"] = get_pdf_page_count(content)
+    elif extension in IMAGE_EXTENSIONS:
+        values["thumbnail"] = file.thumbnail_url or file.make_thumbnail(set_as_thumbnail=attached)
+    return values
+
+
+def remove_unreferenced_file(file_url, path):
+    """Delete a duplicate copy from disk unless a File or a live or archived supporting
+    document still refers to its URL."""
+    if (
+        frappe.db.exists("File", {"file_url": file_url})
+        or frappe.db.exists("Supporting Document", {"attachment": file_url})
+        or frappe.db.exists("Archived Supporting Document", {"attachment": file_url})
+    ):
+        return
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def get_attachment_file(application, file_url):
+    name = frappe.db.get_value(
+        "File",
+        {
+            "file_url": file_url,
+            "attached_to_doctype": "Document Application",
+            "attached_to_name": application,
+        },
+    ) or frappe.db.get_value("File", {"file_url": file_url})
+    if not name:
+        frappe.throw(f"File {file_url} not found.")
+    return frappe.get_doc("File", name)
+
+
+def get_pdf_page_count(content):
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(content)).pages)
@@ -0,0 +1,444 @@
+"""Synthetic data and repeatable timings for the Pro Work doctypes.
+
+Everything generated is prefixed (``BENCH-`` names, ``Bench`` masters) so it
+can be removed again with clear_benchmark_data. Only the local site's MariaDB
+and Redis are used.
+"""
+
+import json
+import random
+import subprocess
+import time
+from pathlib import Path
+
+import frappe
+from frappe.utils import add_days, get_first_day, getdate, now_datetime, nowdate
+
+from quantbit_pro_work_management.name_search import NAME_FIELDS, update_name_tokens
+from quantbit_pro_work_management.profiling import count_queries
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+    get_active_key,
+    get_next_reminder_date,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup import (
+    rebuild_rollup,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket import (
+    rebuild_expiry_buckets,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index import (
+    refresh_applicant_entries,
+    refresh_document_application_entries,
+)
+
+BENCH_PREFIX = "BENCH-"
+INSERT_BATCH_SIZE = 10000
+DERIVED_BATCH_SIZE = 1000
+FIRST_NAMES = [
+    "Aarav", "Fatima", "José", "Mei", "Olga", "Chinedu", "Priya", "Zoë", "Mohammed", "Ana",
+    "Hiroshi", "Renée", "Ömer", "Sofía", "Kwame", "Ingrid", "Rahul", "Leïla", "Dmitri", "Grace",
+]
+LAST_NAMES = [
+    "Sharma", "Al-Mansouri", "García", "Chen", "Ivanova", "Okafor", "Patel", "Müller", "Haddad",
+    "Silva", "Tanaka", "Dubois", "Yilmaz", "López", "Mensah", "Johansson", "Kumar", "Benali",
+]
+VALIDITY_DAYS = [90, 180, 365, 730, 1825]
+REMINDER_DAYS = [15, 30, 60]
+
+
+def generate_benchmark_data(
+    seed=42, document_types=50, applicants=20000, applications=300000, supporting_documents=2
+):
+    """Create masters, applicants and renewal / extension chains of applications."""
+    rng = random.Random(seed)
+    today = getdate(nowdate())
+    type_names = create_masters(rng, document_types)
+    document_types_by_name = {
+        doc.name: doc
+        for doc in frappe.get_all(
+            "Document Type",
+            filters={"name": ["in", type_names]},
+            fields=["name", "document_category", "validity_days"],
+        )
+    }
+
+    applicant_rows = []
+    applicant_names = {}
+    for i in range(1, applicants + 1):
+        name = f"{BENCH_PREFIX}APL-{i:07d}"
+        full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        applicant_names[name] = full_name
+        applicant_rows.append({
+            "name": name,
+            "applicant_type": "External",
+            "full_name": full_name,
+            "gender": rng.choice(["Male", "Female"]),
+            "passport_no": f"BP{i:08d}",
+            "normalized_passport_no": f"BP{i:08d}",
+            "passport_expiry": add_days(today, rng.randint(-365, 3650)),
+            "status": "Active",
+        })
+    bulk_insert_rows("Applicant", applicant_rows)
+
+    application_rows = []
+    supporting_rows = []
+    active_keys = set()
+    counter = 0
+    while counter < applications:
+        applicant = f"{BENCH_PREFIX}APL-{rng.randint(1, applicants):07d}"
+        document_type = document_types_by_name[rng.choice(type_names)]
+        days = document_type.validity_days
+        issue_date = add_days(today, -rng.randint(0, 3 * days))
+        chain_length = min(rng.choice([1, 1, 2, 2, 3]), applications - counter)
+        previous = None
+        chain = []
+        for position in range(chain_length):
+            counter += 1
+            name = f"{BENCH_PREFIX}APP-{counter:08d}"
+            row = {
+                "name": name,
+                "applicant_type": "External",
+                "applicant": applicant,
+                "applicant_full_name": applicant_names[applicant],
+                "passport_no": f"BP{int(applicant[-7:]):08d}",
+                "document_type": document_type.name,
+                "document_category": document_type.document_category,
+                "posting_date": issue_date,
+                "issue_date": issue_date,
+                "validity_days": days,
+                "docstatus": 1,
+                "fees": rng.randint(100, 5000),
+            }
+            if previous is None:
+                row.update({"transaction_type": "New Application", "expiry_date": add_days(issue_date, days - 1)})
+                effective = row["expiry_date"]
+            elif rng.random() < 0.7:
+                row.update({
+                    "transaction_type": "Renewal",
+                    "previous_document": previous["name"],
+                    "previous_expiry_date": previous["effective_expiry_date"],
+                    "expiry_date": previous["effective_expiry_date"],
+                    "new_expiry_date": add_days(previous["effective_expiry_date"], days - 1),
+                })
+                effective = row["new_expiry_date"]
+            else:
+                row.update({
+                    "transaction_type": "Extension",
+                    "previous_referred_document": previous["name"],
+                    "previous_referred_expiry_date": previous["effective_expiry_date"],
+                    "expiry_date": previous["effective_expiry_date"],
+                    "extended_date": add_days(previous["effective_expiry_date"], rng.randint(30, 180)),
+                })
+                effective = row["extended_date"]
+            row["effective_expiry_date"] = effective
+            row["next_reminder_date"] = get_next_reminder_date(effective, document_type.name)
+            row["status"] = "Expired" if getdate(effective) < today else rng.choice(["Active", "Issued"])
+            if position == chain_length - 1 and rng.random() < 0.05:
+                row.update({"docstatus": 0, "status": "Draft"})
+            elif previous:
+                previous["status"] = "Renewed" if row["transaction_type"] == "Renewal" else "Extended"
+            for idx in range(1, rng.randint(0, supporting_documents) + 1):
+                supporting_type = document_types_by_name[rng.choice(type_names)]
+                supporting_issue = add_days(issue_date, -rng.randint(0, 365))
+                supporting_rows.append({
+                    "name": frappe.generate_hash(length=10),
+                    "parent": name,
+                    "parenttype": "Document Application",
+                    "parentfield": "supporting_document",
+                    "idx": idx,
+                    "document_type": supporting_type.name,
+                    "issue_date": supporting_issue,
+                    "expiry_date": add_days(supporting_issue, supporting_type.validity_days - 1),
+                    "attachment": f"/files/bench-{rng.randint(1, 500)}.pdf",
+                    "verified": rng.randint(0, 1),
+                })
+            application_rows.append(row)
+            chain.append(row)
+            previous = row
+            issue_date = add_days(effective, -rng.randint(0, 30))
+        for position, row in enumerate(chain):
+            # what set_lineage / rebuild_lineage give submitted documents; drafts have no lineage
+            submitted = row["docstatus"] == 1
+            following = chain[position + 1] if position + 1 < len(chain) else None
+            row.update({
+                "root_document": chain[0]["name"] if submitted else None,
+                "chain_depth": position if submitted else 0,
+                "is_head": int(submitted and not (following and following["docstatus"] == 1)),
+            })
+            if row["status"] != "Active":
+                continue
+            # the unique active_key index allows one Active document per applicant and type
+            active_key = get_active_key(row["applicant"], row["document_type"])
+            if active_key in active_keys:
+                row["status"] = "Issued"
+            else:
+                active_keys.add(active_key)
+                row["active_key"] = active_key
+        if len(application_rows) >= INSERT_BATCH_SIZE:
+            bulk_insert_rows("Document Application", application_rows)
+            bulk_insert_rows("Supporting Document", supporting_rows)
+            application_rows, supporting_rows = [], []
+    bulk_insert_rows("Document Application", application_rows)
+    bulk_insert_rows("Supporting Document", supporting_rows)
+
+    rebuild_derived_data()
+    return {"document_types": len(type_names), "applicants": applicants, "applications": counter}
+
+
+def create_masters(rng, document_types):
+    categories = []
+    for i in range(1, max(document_types // 5, 1) + 1):
+        name = f"Bench Category {i:02d}"
+        if not frappe.db.exists("Document Category", name):
+            frappe.get_doc({
+                "doctype": "Document Category",
+                "category_name": name,
+                "category_code": f"BC{i:02d}",
+            }).insert(ignore_permissions=True)
+        categories.append(name)
+    type_names = []
+    for i in range(1, document_types + 1):
+        name = f"Bench Type {i:03d}"
+        if not frappe.db.exists("Document Type", name):
+            frappe.get_doc({
+                "doctype": "Document Type",
+                "document_type_name": name,
+                "document_category": rng.choice(categories),
+                "validity_days": rng.choice(VALIDITY_DAYS),
+                "reminder_days_before_expiry": rng.choice(REMINDER_DAYS),
+                "has_expiry": 1,
+                "renewal_allowed": 1,
+            }).insert(ignore_permissions=True)
+        type_names.append(name)
+    frappe.db.commit()
+    return type_names
+
+
+def bulk_insert_rows(doctype, rows):
+    if not rows:
+        return
+    timestamp = now_datetime()
+    user = frappe.session.user
+    fields = sorted({field for row in rows for field in row})
+    frappe.db.bulk_insert(
+        doctype,
+        ["creation", "modified", "owner", "modified_by", *fields],
+        [(timestamp, timestamp, user, user, *(row.get(field) for field in fields)) for row in rows],
+        chunk_size=INSERT_BATCH_SIZE,
+    )
+    frappe.db.commit()
+
+
+def rebuild_derived_data():
+    """Derive for the generated records what save hooks would have maintained.
+
+    The Expiry Index and name search tokens are only refreshed for BENCH-
+    records, so real entries keep their state. The rollup and expiry buckets
+    are plain counts recomputed from the source tables.
+    """
+    rebuild_rollup()
+    rebuild_expiry_buckets()
+    for doctype, refresh in (
+        ("Applicant", refresh_applicant_entries),
+        ("Document Application", refresh_document_application_entries),
+    ):
+        for names in get_benchmark_names(doctype):
+            refresh(names)
+            update_name_tokens(
+                doctype,
+                dict(frappe.get_all(
+                    doctype, filters={"name": ["in", names]}, fields=["name", NAME_FIELDS[doctype]], as_list=True
+                )),
+            )
+            frappe.db.commit()
+
+
+def get_benchmark_names(doctype, batch_size=DERIVED_BATCH_SIZE):
+    """Yield the names of the generated records of `doctype` in batches."""
+    last_name = BENCH_PREFIX
+    while names := frappe.get_all(
+        doctype,
+        filters=[["name", "like", f"{BENCH_PREFIX}%"], ["name", ">", last_name]],
+        pluck="name",
+        order_by="name",
+        limit=batch_size,
+    ):
+        yield names
+        last_name = names[-1]
+
+
+def clear_benchmark_data():
+    frappe.db.delete("Supporting Document", {"parent": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Archived Supporting Document", {"parent": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Document Application", {"name": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Document Application Archive", {"name": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Applicant", {"name": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Document Type", {"name": ["like", "Bench Type %"]})
+    frappe.db.delete("Document Category", {"name": ["like", "Bench Category %"]})
+    frappe.db.delete("Expiry Index", {"reference_name": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Expiry Index", {"parent_document": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Name Search Token", {"reference_name": ["like", f"{BENCH_PREFIX}%"]})
+    frappe.db.delete("Document Reminder Ledger", {"document_application": ["like", f"{BENCH_PREFIX}%"]})
+    rebuild_rollup()
+    rebuild_expiry_buckets()
+    frappe.db.commit()
+    frappe.clear_cache()
+
+
+def run_benchmarks(output=None, runs=20, seed=42):
+    """Time the hot paths against the current site and write the results as JSON.
+
+    Every timed operation is rolled back, so runs are repeatable on the same data.
+    """
+    random.seed(seed)
+    results = {
+        "site": frappe.local.site,
+        "timestamp": str(now_datetime()),
+        "commit": get_git_commit(),
+        "volumes": {
+            doctype: frappe.db.count(doctype)
+            for doctype in ("Applicant", "Document Application", "Supporting Document")
+        },
+        "results": {},
+    }
+    benchmarks = {
+        "save_new_application": bench_save_new_application,
+        "submit_new_application": bench_submit_new_application,
+        "submit_renewal": bench_submit_renewal,
+        "daily_expiry_job": bench_daily_expiry_job,
+        "report_no_filters": lambda: bench_report({}),
+        "report_date_range": lambda: bench_report({
+            "from_date": get_first_day(add_days(nowdate(), -365)),
+            "to_date": nowdate(),
+        }),
+        "report_name_search": lambda: bench_report({"applicant_full_name": "jose gar"}),
+        "report_summary": lambda: bench_report({"view": "Summary"}),
+    }
+    for name, fn in benchmarks.items():
+        count = 1 if name == "daily_expiry_job" else runs
+        timings = []
+        queries = []
+        for _ in range(count):
+            elapsed, query_count = time_call(fn)
+            timings.append(elapsed)
+            queries.append(query_count)
+            frappe.db.rollback()
+        results["results"][name] = summarize(timings, queries)
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2, default=str))
+    return results
+
+
+def time_call(fn):
+    """Run fn once and return (elapsed ms, SQL query count)."""
+    with count_queries() as counter:
+        start = time.perf_counter()
+        try:
+            fn()
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, counter["count"]
+
+
+def summarize(timings, queries):
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "min_ms": round(timings[0], 2),
+        "max_ms": round(timings[-1], 2),
+        "p50_queries": percentile(sorted(queries), 50),
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def get_random_applicant():
+    return frappe.db.sql(
+        f"""
+        SELECT name FROM `tabApplicant`
+        WHERE name LIKE '{BENCH_PREFIX}%%'
+        ORDER BY name
+        LIMIT 1 OFFSET %s
+        """,
+        random.randint(0, 999),
+    )[0][0]
+
+
+def new_application():
+    document_type = frappe.db.get_value("Document Type", {"name": ["like", "Bench Type %"]}, "name")
+    return frappe.get_doc({
+        "doctype": "Document Application",
+        "applicant_type": "External",
+        "applicant": get_random_applicant(),
+        "document_type": document_type,
+        "transaction_type": "New Application",
+        "posting_date": nowdate(),
+        "issue_date": nowdate(),
+        "status": "Issued",
+        "supporting_document": [
+            {"document_type": document_type, "issue_date": nowdate(), "attachment": "/files/bench-1.pdf"}
+        ],
+    })
+
+
+def bench_save_new_application():
+    new_application().insert()
+
+
+def bench_submit_new_application():
+    doc = new_application()
+    doc.insert()
+    doc.submit()
+
+
+def bench_submit_renewal():
+    previous = frappe.db.get_value(
+        "Document Application",
+        {"name": ["like", f"{BENCH_PREFIX}%"], "docstatus": 1, "status": "Issued"},
+        ["name", "applicant", "document_type", "expiry_date"],
+        as_dict=True,
+    )
+    doc = frappe.get_doc({
+        "doctype": "Document Application",
+        "applicant_type": "External",
+        "applicant": previous.applicant,
+        "document_type": previous.document_type,
+        "transaction_type": "Renewal",
+        "previous_document": previous.name,
+        "posting_date": nowdate(),
+        "status": "Issued",
+    })
+    doc.insert()
+    doc.submit()
+
+
+def bench_daily_expiry_job():
+    from quantbit_pro_work_management.tasks import process_due_documents
+
+    process_due_documents(getdate(nowdate()), commit=False)
+
+
+def bench_report(filters):
+    from quantbit_pro_work_management.quantbit_pro_work_management.report.document_application_report.document_application_report import (
+        execute,
+    )
+
+    execute(frappe._dict(filters))
+
+
+def get_git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, text=True
+        ).strip()
+    except Exception:
+        return None
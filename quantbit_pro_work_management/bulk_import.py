@@ -0,0 +1,253 @@
+import csv
+import io
+
+import frappe
+
+from quantbit_pro_work_management.master_data import get_document_type
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+    LifecycleContext,
+)
+
+IMPORT_CHUNK_SIZE = 500
+BACKGROUND_THRESHOLD = 200
+IMPORT_RESULT_EXPIRY = 24 * 60 * 60
+SNAPSHOT_DOCUMENT_FIELDS = [
+    "name",
+    "applicant",
+    "document_type",
+    "docstatus",
+    "status",
+    "expiry_date",
+    "root_document",
+    "chain_depth",
+    "is_head",
+    "creation",
+]
+
+
+class ImportSnapshot(LifecycleContext):
+    """Everything a batch of Document Applications refers to, loaded in a few set-based queries.
+
+    Set on `doc.flags.import_snapshot`, it replaces the per-save LifecycleContext
+    so the lookups DocumentApplication.validate makes are answered from memory.
+    """
+
+    def __init__(self, rows):
+        link_values = get_link_values(rows)
+        applicants = link_values.get("Applicant", set())
+        document_types = link_values.get("Document Type", set())
+
+        self.employees = {
+            employee.name: employee
+            for employee in get_all_in(
+                "Employee", link_values.get("Employee"), ["name", "employee_name", "date_of_birth", "gender"]
+            )
+        }
+        self.applicants = {
+            applicant.name: applicant
+            for applicant in get_all_in("Applicant", applicants, ["name", "full_name", "passport_no"])
+        }
+        self.existing_links = {
+            "Employee": set(self.employees),
+            "Applicant": set(self.applicants),
+            "Document Type": {name for name in document_types if get_document_type(name)},
+        }
+        for doctype, names in link_values.items():
+            if doctype not in self.existing_links and doctype != "Document Application":
+                self.existing_links[doctype] = {row.name for row in get_all_in(doctype, names, ["name"])}
+
+        self.documents = {}
+        self.latest_active = {}
+        for doc in get_all_in("Document Application", link_values.get("Document Application"), SNAPSHOT_DOCUMENT_FIELDS):
+            self.documents[doc.name] = doc
+        if document_types:
+            include_blank = any(not row.get("applicant") for row in rows)
+            existing = frappe.db.sql(
+                f"""
+                SELECT {", ".join(SNAPSHOT_DOCUMENT_FIELDS)}
+                FROM `tabDocument Application`
+                WHERE document_type IN %(document_types)s
+                    AND status IN ('Active', 'Issued')
+                    AND (applicant IN %(applicants)s
+                        {"OR IFNULL(applicant, '') = ''" if include_blank else ""})
+                ORDER BY creation
+                """,
+                {"document_types": list(document_types), "applicants": list(applicants) or [""]},
+                as_dict=True,
+            )
+            for doc in existing:
+                self.add(doc)
+
+    def add(self, doc):
+        key = (doc.applicant or "", doc.document_type)
+        self.documents[doc.name] = doc
+        if doc.docstatus == 1 and doc.is_head and doc.status in ("Active", "Issued"):
+            self.latest_active[key] = doc
+
+    def get_employee(self, employee):
+        return self.employees.get(employee)
+
+    def get_document(self, name):
+        return self.documents.get(name)
+
+    def get_latest_active(self, applicant, document_type):
+        return self.latest_active.get((applicant or "", document_type))
+
+    def link_exists(self, doctype, name):
+        if doctype == "Document Application":
+            # includes the rows inserted earlier in the same import
+            return name in self.documents
+        return name in self.existing_links.get(doctype, ())
+
+    def validate_links(self, doc):
+        """Stand-in for Document._validate_links, which is skipped for imported rows.
+
+        Every Link field of the row and of its child rows is checked, and the
+        fetch_from fields are filled from the snapshot.
+        """
+        for d in [doc, *doc.get_all_children()]:
+            for df in d.meta.get_link_fields():
+                value = d.get(df.fieldname)
+                if value and not self.link_exists(df.options, value):
+                    prefix = f"Row {d.idx}: " if d.get("parentfield") else ""
+                    frappe.throw(f"{prefix}{df.label} {value} does not exist.")
+        if doc.applicant:
+            applicant = self.applicants[doc.applicant]
+            doc.applicant_full_name = doc.applicant_full_name or applicant.full_name
+            doc.passport_no = applicant.passport_no
+        doc_type = get_document_type(doc.document_type)
+        if doc_type:
+            doc.validity_days = doc_type.validity_days
+        if doc.previous_referred_document and not doc.previous_referred_expiry_date:
+            previous = self.get_document(doc.previous_referred_document)
+            doc.previous_referred_expiry_date = previous.expiry_date
+
+
+def get_link_values(rows):
+    """{linked doctype: names} over the Link fields of the rows and their child rows."""
+    meta = frappe.get_meta("Document Application")
+    values = {}
+    for row in rows:
+        records = [(meta, row)]
+        for df in meta.get_table_fields():
+            child_meta = frappe.get_meta(df.options)
+            records.extend((child_meta, child) for child in row.get(df.fieldname) or [])
+        for record_meta, record in records:
+            for df in record_meta.get_link_fields():
+                if record.get(df.fieldname):
+                    values.setdefault(df.options, set()).add(record.get(df.fieldname))
+    return values
+
+
+def get_all_in(doctype, names, fields):
+    if not names:
+        return []
+    return frappe.get_all(doctype, filters={"name": ["in", list(names)]}, fields=fields)
+
+
+@frappe.whitelist()
+def import_document_applications(data=None, file_url=None, file_format="json", run_in_background=None):
+    """Import Document Applications from a JSON list or CSV.
+
+    Small batches are imported in the request and return the per-row report;
+    larger ones (or run_in_background=1) go to the long queue and return a
+    job_id whose report is fetched with get_import_result.
+    """
+    frappe.has_permission("Document Application", "create", throw=True)
+    if file_url:
+        data = get_import_file_content(file_url)
+        file_format = "csv" if file_url.lower().endswith(".csv") else file_format
+    rows = parse_rows(data, file_format)
+    if run_in_background is None:
+        run_in_background = len(rows) > BACKGROUND_THRESHOLD
+    if not frappe.utils.cint(run_in_background):
+        return run_import(rows)
+    job_id = f"document_application_import::{frappe.generate_hash(length=10)}"
+    frappe.enqueue(
+        "quantbit_pro_work_management.bulk_import.run_import",
+        queue="long",
+        timeout=3600,
+        job_id=job_id,
+        rows=rows,
+        job_id_for_result=job_id,
+    )
+    return {"job_id": job_id}
+
+
+def get_import_file_content(file_url):
+    """Content of a file the session user uploaded and may read."""
+    file = frappe.get_doc("File", {"file_url": file_url})
+    file.check_permission("read")
+    if file.owner != frappe.session.user:
+        frappe.throw("Only files you uploaded can be imported.", frappe.PermissionError)
+    return file.get_content()
+
+
+@frappe.whitelist()
+def get_import_result(job_id):
+    result = frappe.cache.get_value(f"{job_id}::result")
+    if result and result.get("user") not in (frappe.session.user, None):
+        frappe.only_for("System Manager")
+    return result
+
+
+def parse_rows(data, file_format="json"):
+    if isinstance(data, bytes):
+        data = data.decode("utf-8-sig")
+    if file_format == "csv":
+        return [
+            {key: value for key, value in row.items() if value not in (None, "")}
+            for row in csv.DictReader(io.StringIO(data))
+        ]
+    rows = frappe.parse_json(data) if isinstance(data, str) else data
+    if not isinstance(rows, list):
+        frappe.throw("Import data must be a list of Document Applications.")
+    return rows
+
+
+def run_import(rows, job_id_for_result=None):
+    """Validate rows against one prefetched snapshot and insert them in chunked transactions."""
+    snapshot = ImportSnapshot(rows)
+    result = {"total": len(rows), "inserted": [], "errors": [], "user": frappe.session.user}
+    for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        for idx, row in enumerate(rows[start : start + IMPORT_CHUNK_SIZE], start=start + 1):
+            frappe.db.savepoint("document_application_import")
+            try:
+                doc = import_row(row, snapshot)
+            except Exception as e:
+                frappe.db.rollback(save_point="document_application_import")
+                result["errors"].append({"row": idx, "error": frappe.utils.strip_html(str(e))})
+                frappe.clear_messages()
+                continue
+            result["inserted"].append({"row": idx, "name": doc.name})
+        frappe.db.commit()
+    if job_id_for_result:
+        frappe.cache.set_value(
+            f"{job_id_for_result}::result", result, expires_in_sec=IMPORT_RESULT_EXPIRY
+        )
+        frappe.publish_realtime(
+            "document_application_import_complete",
+            {"job_id": job_id_for_result, "inserted": len(result["inserted"]), "errors": len(result["errors"])},
+            user=frappe.session.user,
+        )
+    return result
+
+
+def import_row(row, snapshot):
+    row = {key: value for key, value in row.items() if key not in ("name", "docstatus", "doctype")}
+    doc = frappe.get_doc({"doctype": "Document Application", **row})
+    doc.flags.import_snapshot = snapshot
+    doc.flags.ignore_links = True
+    snapshot.validate_links(doc)
+    doc.insert()
+    snapshot.add(
+        frappe._dict(
+            name=doc.name,
+            applicant=doc.applicant,
+            document_type=doc.document_type,
+            docstatus=doc.docstatus,
+            status=doc.status,
+            expiry_date=doc.expiry_date,
+        )
+    )
+    return doc
@@ -0,0 +1,128 @@
+import frappe
+from frappe.utils import cint, nowdate
+
+from quantbit_pro_work_management.bulk_import import IMPORT_RESULT_EXPIRY, ImportSnapshot
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+    set_chain_heads,
+    set_status_in_bulk,
+)
+
+RENEWAL_CHUNK_SIZE = 200
+BACKGROUND_THRESHOLD = 100
+PREVIOUS_DOCUMENT_FIELDS = {
+    "Renewal": ("previous_document", "previous_expiry_date", "Renewed"),
+    "Extension": ("previous_referred_document", "previous_referred_expiry_date", "Extended"),
+}
+# a renewal or extension is submitted directly, so only the live statuses are allowed
+RENEWED_STATUSES = ("Issued", "Active")
+COPIED_FIELDS = [
+    "applicant_type",
+    "employee",
+    "applicant",
+    "document_type",
+    "country",
+    "purpose",
+]
+
+
+@frappe.whitelist()
+def bulk_renew(names, transaction_type="Renewal", status="Issued", extended_date=None, run_in_background=None):
+    """Create and submit a Renewal / Extension for each of the given Document Applications.
+
+    Large batches go to the long queue and return a job_id; a
+    document_application_renewal_complete realtime event announces the end of
+    the job, and the per-document report is then available from
+    bulk_import.get_import_result.
+    """
+    frappe.has_permission("Document Application", "submit", throw=True)
+    names = frappe.parse_json(names) if isinstance(names, str) else names
+    if transaction_type not in PREVIOUS_DOCUMENT_FIELDS:
+        frappe.throw("Transaction Type must be Renewal or Extension.")
+    if status not in RENEWED_STATUSES:
+        frappe.throw("Status must be Issued or Active.")
+    if transaction_type == "Extension" and not extended_date:
+        frappe.throw("Extended Date is required for bulk extension.")
+    if run_in_background is None:
+        run_in_background = len(names) > BACKGROUND_THRESHOLD
+    kwargs = {
+        "names": names,
+        "transaction_type": transaction_type,
+        "status": status,
+        "extended_date": extended_date,
+    }
+    if not cint(run_in_background):
+        return run_bulk_renewal(**kwargs)
+    job_id = f"document_application_renewal::{frappe.generate_hash(length=10)}"
+    frappe.enqueue(
+        "quantbit_pro_work_management.bulk_renewal.run_bulk_renewal",
+        queue="long",
+        timeout=3600,
+        job_id=job_id,
+        job_id_for_result=job_id,
+        **kwargs,
+    )
+    return {"job_id": job_id}
+
+
+def run_bulk_renewal(names, transaction_type, status="Issued", extended_date=None, job_id_for_result=None):
+    link_field, expiry_field, previous_status = PREVIOUS_DOCUMENT_FIELDS[transaction_type]
+    previous_documents = {
+        doc.name: doc
+        for doc in frappe.get_all(
+            "Document Application",
+            filters={"name": ["in", names]},
+            fields=["name", "expiry_date", *COPIED_FIELDS],
+        )
+    }
+    rows = []
+    for name in names:
+        previous = previous_documents.get(name) or frappe._dict(name=name)
+        row = {fieldname: previous.get(fieldname) for fieldname in COPIED_FIELDS}
+        row.update({
+            "transaction_type": transaction_type,
+            "posting_date": nowdate(),
+            "status": status,
+            link_field: name,
+            expiry_field: previous.expiry_date,
+        })
+        if transaction_type == "Extension":
+            row["extended_date"] = extended_date
+        rows.append(row)
+
+    snapshot = ImportSnapshot(rows)
+    result = {"total": len(rows), "inserted": [], "errors": [], "user": frappe.session.user}
+    for start in range(0, len(rows), RENEWAL_CHUNK_SIZE):
+        renewed = []
+        for row in rows[start : start + RENEWAL_CHUNK_SIZE]:
+            frappe.db.savepoint("document_application_renewal")
+            try:
+                doc = frappe.get_doc({"doctype": "Document Application", "docstatus": 1, **row})
+                doc.flags.import_snapshot = snapshot
+                doc.flags.ignore_links = True
+                doc.flags.defer_previous_status_update = True
+                snapshot.validate_links(doc)
+                # the previous document's status is rewritten below, so the user must be able to edit it
+                frappe.has_permission("Document Application", "write", doc=row[link_field], throw=True)
+                # frees the previous document's active_key for a new Active row; rolled back with the row
+                set_status_in_bulk([row[link_field]], previous_status)
+                doc.insert()
+            except Exception as e:
+                frappe.db.rollback(save_point="document_application_renewal")
+                result["errors"].append({"previous": row[link_field], "error": frappe.utils.strip_html(str(e))})
+                frappe.clear_messages()
+                continue
+            # a later row for the same previous document must now fail validation
+            snapshot.get_document(row[link_field]).status = previous_status
+            renewed.append(row[link_field])
+            result["inserted"].append({"previous": row[link_field], "name": doc.name})
+        set_chain_heads(renewed, 0)
+        frappe.db.delete("Document Reminder Ledger", {"document_application": ["in", renewed or [""]]})
+        frappe.db.commit()
+    if job_id_for_result:
+        frappe.cache.set_value(f"{job_id_for_result}::result", result, expires_in_sec=IMPORT_RESULT_EXPIRY)
+        frappe.publish_realtime(
+            "document_application_renewal_complete",
+            {"job_id": job_id_for_result, "inserted": len(result["inserted"]), "errors": len(result["errors"])},
+            user=frappe.session.user,
+        )
+    return result
@@ -0,0 +1,77 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-document-rollup")
+@pass_context
+def rebuild_document_rollup(context):
+    "Recompute the Document Application Rollup and Document Expiry Buckets from the application table"
+    from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup import (
+        rebuild_rollup,
+    )
+    from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket import (
+        rebuild_expiry_buckets,
+    )
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        frappe.set_user("Administrator")
+        buckets = rebuild_rollup()
+        click.echo(f"Rebuilt {buckets} rollup buckets")
+        click.echo(f"Rebuilt {rebuild_expiry_buckets()} expiry buckets")
+    finally:
+        frappe.destroy()
+
+
+@click.command("generate-benchmark-data")
+@click.option("--seed", default=42, type=int, help="Random seed, so the same data is generated every time")
+@click.option("--document-types", default=50, type=int)
+@click.option("--applicants", default=20000, type=int)
+@click.option("--applications", default=300000, type=int)
+@click.option("--clear", is_flag=True, help="Remove previously generated benchmark data first")
+@pass_context
+def generate_benchmark_data(context, seed, document_types, applicants, applications, clear):
+    "Create synthetic Applicants and Document Application chains for benchmarking"
+    from quantbit_pro_work_management import benchmark
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        frappe.set_user("Administrator")
+        if clear:
+            benchmark.clear_benchmark_data()
+        counts = benchmark.generate_benchmark_data(
+            seed=seed, document_types=document_types, applicants=applicants, applications=applications
+        )
+        click.echo(f"Generated {counts}")
+    finally:
+        frappe.destroy()
+
+
+@click.command("run-benchmark")
+@click.option("--output", default="pro_work_benchmark.json", help="File the JSON results are written to")
+@click.option("--runs", default=20, type=int, help="Repetitions of each timed operation")
+@click.option("--seed", default=42, type=int)
+@pass_context
+def run_benchmark(context, output, runs, seed):
+    "Time save / submit, renewal, the daily expiry job and the report; every run is rolled back"
+    from quantbit_pro_work_management.benchmark import run_benchmarks
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        frappe.set_user("Administrator")
+        results = run_benchmarks(output=output, runs=runs, seed=seed)
+        for name, result in results["results"].items():
+            click.echo(f"{name:28} p50 {result['p50_ms']:>10} ms  p95 {result['p95_ms']:>10} ms")
+        click.echo(f"Results written to {output}")
+    finally:
+        frappe.destroy()
+
+
+commands = [rebuild_document_rollup, generate_benchmark_data, run_benchmark]
@@ -0,0 +1,99 @@
+import frappe
+
+from quantbit_pro_work_management.master_data import clear_master_data_cache
+from quantbit_pro_work_management.name_search import update_name_tokens
+from quantbit_pro_work_management.portal import clear_applicant_documents_cache
+
+CLOSED_STATUSES = ("Rejected", "Renewed", "Extended", "Expired", "Cancelled")
+
+
+def on_employee_update(doc, method=None):
+    """doc_events handler: drop the cached snapshot and push changes to denormalized copies.
+
+    clear_master_data_cache drops the snapshot again after commit, so a save
+    racing this one cannot copy the old name, date of birth or gender into a
+    new Applicant or Document Application.
+    """
+    clear_master_data_cache("Employee", doc.name)
+    previous = doc.get_doc_before_save()
+    if previous and not any(
+        previous.get(fieldname) != doc.get(fieldname)
+        for fieldname in ("employee_name", "date_of_birth", "gender")
+    ):
+        return
+    sync_employee(doc.name, doc.employee_name, doc.date_of_birth, doc.gender)
+
+
+def on_employee_trash(doc, method=None):
+    clear_master_data_cache("Employee", doc.name)
+
+
+def on_employee_rename(doc, method=None, old=None, new=None, merge=False):
+    clear_master_data_cache("Employee", old)
+    clear_master_data_cache("Employee", new)
+
+
+def sync_employee(employee, employee_name, date_of_birth, gender):
+    """Update the Applicants and open Document Applications of an employee in bulk."""
+    applicants = frappe.get_all(
+        "Applicant",
+        filters={"applicant_type": "Employee", "employee": employee},
+        pluck="name",
+    )
+    if applicants:
+        frappe.db.sql(
+            """
+            UPDATE `tabApplicant`
+            SET full_name = %(employee_name)s, date_of_birth = %(date_of_birth)s, gender = %(gender)s
+            WHERE name IN %(names)s
+            """,
+            {
+                "names": applicants,
+                "employee_name": employee_name,
+                "date_of_birth": date_of_birth,
+                "gender": gender,
+            },
+        )
+        update_name_tokens("Applicant", {name: employee_name for name in applicants})
+
+    # open applications where any of the copied fields differ (NULL-safe)
+    applications = frappe.db.sql(
+        """
+        SELECT name, applicant
+        FROM `tabDocument Application`
+        WHERE applicant_type = 'Employee'
+            AND employee = %(employee)s
+            AND docstatus < 2
+            AND status NOT IN %(closed_statuses)s
+            AND NOT (
+                applicant_full_name <=> %(employee_name)s
+                AND date_of_birth <=> %(date_of_birth)s
+                AND gender <=> %(gender)s
+            )
+        """,
+        {
+            "employee": employee,
+            "closed_statuses": CLOSED_STATUSES,
+            "employee_name": employee_name,
+            "date_of_birth": date_of_birth,
+            "gender": gender,
+        },
+        as_dict=True,
+    )
+    if applications:
+        names = [row.name for row in applications]
+        frappe.db.sql(
+            """
+            UPDATE `tabDocument Application`
+            SET applicant_full_name = %(employee_name)s, date_of_birth = %(date_of_birth)s, gender = %(gender)s
+            WHERE name IN %(names)s
+            """,
+            {
+                "names": names,
+                "employee_name": employee_name,
+                "date_of_birth": date_of_birth,
+                "gender": gender,
+            },
+        )
+        update_name_tokens("Document Application", {name: employee_name for name in names})
+    clear_applicant_documents_cache([*applicants, *(row.applicant for row in applications)])
@@ -64,6 +64,13 @@ app_license = "mit"
 # 	"Role": "home_page"
 # }
 
+# Portal
+# ------
+
+standard_portal_menu_items = [
+    {"title": "My Documents", "route": "/my-documents"},
+]
+
 # Generators
 # ----------
 
@@ -85,6 +92,8 @@ app_license = "mit"
 # before_install = "quantbit_pro_work_management.install.before_install"
 # after_install = "quantbit_pro_work_management.install.after_install"
 
+after_migrate = ["quantbit_pro_work_management.master_data.clear_all_master_data_cache"]
+
 # Uninstallation
 # ------------
 
@@ -145,6 +154,62 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+    "Document Application": {
+        "validate": "quantbit_pro_work_management.attachments.on_document_application_validate",
+        # on_update also runs on submit, so on_submit is not hooked separately
+        "on_update": [
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.notification_outbox.notification_outbox.on_document_application_change",
+            "quantbit_pro_work_management.name_search.on_name_change",
+            "quantbit_pro_work_management.attachments.on_document_application_update",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index.on_document_application_change",
+            "quantbit_pro_work_management.portal.on_document_application_change",
+        ],
+        "on_update_after_submit": [
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.notification_outbox.notification_outbox.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index.on_document_application_change",
+            "quantbit_pro_work_management.portal.on_document_application_change",
+        ],
+        "on_cancel": [
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket.on_document_application_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index.on_document_application_change",
+            "quantbit_pro_work_management.portal.on_document_application_change",
+        ],
+        "on_trash": [
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup.on_document_application_trash",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket.on_document_application_trash",
+            "quantbit_pro_work_management.name_search.on_trash",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index.on_document_application_trash",
+            "quantbit_pro_work_management.portal.on_document_application_change",
+        ],
+    },
+    "Applicant": {
+        "on_update": [
+            "quantbit_pro_work_management.name_search.on_name_change",
+            "quantbit_pro_work_management.portal.on_applicant_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index.on_applicant_change",
+        ],
+        "on_trash": [
+            "quantbit_pro_work_management.name_search.on_trash",
+            "quantbit_pro_work_management.portal.on_applicant_change",
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index.on_applicant_trash",
+        ],
+    },
+    "Employee": {
+        "on_update": [
+            "quantbit_pro_work_management.employee_sync.on_employee_update",
+            "quantbit_pro_work_management.portal.on_applicant_change",
+        ],
+        "on_trash": "quantbit_pro_work_management.employee_sync.on_employee_trash",
+        "after_rename": "quantbit_pro_work_management.employee_sync.on_employee_rename",
+    },
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -174,6 +239,10 @@ app_license = "mit"
 # Overriding Methods
 # ------------------------------
 #
+standard_queries = {
+    "Applicant": "quantbit_pro_work_management.name_search.applicant_query"
+}
+
 # override_whitelisted_methods = {
 # 	"frappe.desk.doctype.event.event.get_events": "quantbit_pro_work_management.event.get_events"
 # }
@@ -242,15 +311,32 @@ app_license = "mit"
 # 	"Logging DocType Name": 30  # days to retain logs
 # }
 
+default_log_clearing_doctypes = {
+    "Pro Work Profile Log": 30,
+    "Notification Outbox": 30,
+}
+
 # Translation
 # ------------
 # List of apps whose translatable strings should be excluded from this app's translations.
 # ignore_translatable_strings_from = []
 
 scheduler_events = {
+    "cron": {
+        "* * * * *": [
+            "quantbit_pro_work_management.quantbit_pro_work_management.doctype.notification_outbox.notification_outbox.flush_outbox"
+        ]
+    },
+    "hourly": [
+        "quantbit_pro_work_management.attachments.enqueue_pending_attachments",
+    ],
     "daily": [
-        "quantbit_pro_work_management.tasks.check_document_expiry_notifications"
-    ]
+        "quantbit_pro_work_management.tasks.check_document_expiry_notifications",
+        "quantbit_pro_work_management.archive.enqueue_archive",
+    ],
+    "weekly": [
+        "quantbit_pro_work_management.quantbit_pro_work_management.doctype.applicant.applicant.enqueue_duplicate_scan",
+    ],
 }
 
 fixtures = [
@@ -0,0 +1,109 @@
+import frappe
+
+MASTER_DATA_FIELDS = {
+    "Document Type": (
+        "name",
+        "document_category",
+        "has_expiry",
+        "validity_days",
+        "renewal_allowed",
+        "is_active",
+        "reminder_days_before_expiry",
+    ),
+    "Document Category": (
+        "name",
+        "is_active",
+    ),
+    "Employee": (
+        "name",
+        "employee_name",
+        "date_of_birth",
+        "gender",
+    ),
+}
+
+
+def get_document_type(name):
+    return get_master_data("Document Type", name)
+
+
+def get_document_category(name):
+    return get_master_data("Document Category", name)
+
+
+def get_employee(name):
+    return get_master_data("Employee", name)
+
+
+def get_master_data(doctype, name):
+    """Return the cached master fields of a Document Type / Document Category / Employee.
+
+    Lookups hit a per-request dict first, then a shared Redis hash, and only
+    read the database on a miss. Returns None if the record does not exist.
+    """
+    if not name:
+        return None
+    local_cache = get_local_cache(doctype)
+    if name in local_cache:
+        return local_cache[name]
+    values = frappe.cache.hget(get_cache_key(doctype), name)
+    if values is None:
+        values = load_master_data(doctype, name)
+        if not values:
+            return None
+        frappe.cache.hset(get_cache_key(doctype), name, values)
+    values = frappe._dict(values)
+    local_cache[name] = values
+    return values
+
+
+def load_master_data(doctype, name):
+    values = frappe.db.get_value(doctype, name, MASTER_DATA_FIELDS[doctype], as_dict=True)
+    if values and doctype == "Document Type":
+        values.reminder_thresholds = get_reminder_thresholds(
+            values.reminder_days_before_expiry,
+            frappe.get_all(
+                "Document Type Reminder",
+                filters={"parent": name, "parenttype": "Document Type"},
+                pluck="days_before_expiry",
+            ),
+        )
+    return values
+
+
+def get_reminder_thresholds(reminder_days_before_expiry, additional_days=()):
+    """Distinct positive reminder thresholds of a Document Type, largest first."""
+    days = {reminder_days_before_expiry, *additional_days}
+    return sorted((d for d in days if d and d > 0), reverse=True)
+
+
+def clear_master_data_cache(doctype, name=None):
+    """Drop the cached values now and again after commit, so a read racing the
+    transaction cannot re-cache the old values for good."""
+
+    def clear():
+        local_cache = get_local_cache(doctype)
+        if name:
+            local_cache.pop(name, None)
+            frappe.cache.hdel(get_cache_key(doctype), name)
+        else:
+            local_cache.clear()
+            frappe.cache.delete_value(get_cache_key(doctype))
+
+    clear()
+    frappe.db.after_commit.add(clear)
+
+
+def clear_all_master_data_cache():
+    for doctype in MASTER_DATA_FIELDS:
+        clear_master_data_cache(doctype)
+
+
+def get_cache_key(doctype):
+    return f"quantbit_pro_work_management:master_data:{doctype}"
+
+
+def get_local_cache(doctype):
+    if not hasattr(frappe.local, "pro_work_master_data"):
+        frappe.local.pro_work_master_data = {}
+    return frappe.local.pro_work_master_data.setdefault(doctype, {})
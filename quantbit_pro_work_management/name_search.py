@@ -0,0 +1,130 @@
+import re
+import unicodedata
+
+import frappe
+from frappe.desk.reportview import get_filters_cond, get_match_cond
+from frappe.utils import now_datetime
+
+NAME_FIELDS = {
+    "Applicant": "full_name",
+    "Document Application": "applicant_full_name",
+    "Document Application Archive": "applicant_full_name",
+}
+
+
+def normalize_name(value):
+    """Case-fold and strip diacritics, e.g. "José  Müller" -> "jose muller"."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return value.casefold()
+
+
+def get_name_tokens(value):
+    return sorted({token for token in re.split(r"[\W_]+", normalize_name(value)) if token})
+
+
+def on_name_change(doc, method=None):
+    """doc_events handler: re-tokenize the name field when it changes."""
+    fieldname = NAME_FIELDS[doc.doctype]
+    if doc.has_value_changed(fieldname):
+        update_name_tokens(doc.doctype, {doc.name: doc.get(fieldname)})
+
+
+def on_trash(doc, method=None):
+    frappe.db.delete("Name Search Token", {"reference_doctype": doc.doctype, "reference_name": doc.name})
+
+
+def update_name_tokens(doctype, names):
+    """Replace the tokens of several documents given as {docname: full name}."""
+    if not names:
+        return
+    frappe.db.delete(
+        "Name Search Token", {"reference_doctype": doctype, "reference_name": ["in", list(names)]}
+    )
+    timestamp = now_datetime()
+    user = frappe.session.user
+    values = [
+        (frappe.generate_hash(length=12), timestamp, timestamp, user, user, doctype, docname, token)
+        for docname, full_name in names.items()
+        for token in get_name_tokens(full_name)
+    ]
+    frappe.db.bulk_insert(
+        "Name Search Token",
+        ["name", "creation", "modified", "owner", "modified_by", "reference_doctype", "reference_name", "token"],
+        values,
+    )
+
+
+def get_name_search_condition(doctype, query, column="name"):
+    """SQL condition matching documents whose name contains every query token as a word prefix.
+
+    Each token becomes an indexed prefix lookup on (reference_doctype, token)
+    instead of a leading-wildcard LIKE over the whole table. Parameter names
+    include the doctype, so conditions for several doctypes can share a query.
+    """
+    tokens = get_name_tokens(query)
+    if not tokens:
+        return "1=1", {}
+    key = f"name_search_{frappe.scrub(doctype)}"
+    conditions = []
+    values = {f"{key}_doctype": doctype}
+    for i, token in enumerate(tokens):
+        conditions.append(
+            f"""{column} IN (
+                SELECT reference_name FROM `tabName Search Token`
+                WHERE reference_doctype = %({key}_doctype)s
+                    AND token LIKE %({key}_token_{i})s
+            )"""
+        )
+        values[f"{key}_token_{i}"] = f"{token}%"
+    return " AND ".join(conditions), values
+
+
+@frappe.whitelist()
+@frappe.validate_and_sanitize_search_inputs
+def applicant_query(doctype, txt, searchfield, start, page_len, filters):
+    """Link search for Applicant backed by the name token index.
+
+    Also matches a prefix of the name or of `searchfield`, and applies the
+    link field's filters and the user's permissions like the default search.
+    """
+    condition, values = get_name_search_condition("Applicant", txt, column="`tabApplicant`.name")
+    values.update({"txt": f"{txt}%", "start": start, "page_len": page_len})
+    search_conditions = ["`tabApplicant`.name LIKE %(txt)s", condition]
+    if searchfield and searchfield != "name":
+        search_conditions.append(f"`tabApplicant`.`{searchfield}` LIKE %(txt)s")
+    return frappe.db.sql(
+        f"""
+        SELECT `tabApplicant`.name, `tabApplicant`.full_name
+        FROM `tabApplicant`
+        WHERE ({" OR ".join(search_conditions)})
+            {get_filters_cond(doctype, filters, [])}
+            {get_match_cond(doctype)}
+        ORDER BY `tabApplicant`.full_name
+        LIMIT %(start)s, %(page_len)s
+        """,
+        values,
+    )
+
+
+def rebuild_name_tokens(doctype, batch_size=5000):
+    """Tokenize every existing document of `doctype` in batches."""
+    fieldname = NAME_FIELDS[doctype]
+    frappe.db.delete("Name Search Token", {"reference_doctype": doctype})
+    last_name = ""
+    while True:
+        rows = frappe.db.sql(
+            f"""
+            SELECT name, `{fieldname}`
+            FROM `tab{doctype}`
+            WHERE name > %(last_name)s
+            ORDER BY name
+            LIMIT %(batch_size)s
+            """,
+            {"last_name": last_name, "batch_size": batch_size},
+        )
+        if not rows:
+            break
+        update_name_tokens(doctype, dict(rows))
+        frappe.db.commit()
+        last_name = rows[-1][0]
@@ -0,0 +1,7 @@
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup import (
+    rebuild_rollup,
+)
+
+
+def execute():
+    rebuild_rollup()
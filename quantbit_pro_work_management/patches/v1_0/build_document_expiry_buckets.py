@@ -0,0 +1,7 @@
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket import (
+    rebuild_expiry_buckets,
+)
+
+
+def execute():
+    rebuild_expiry_buckets()
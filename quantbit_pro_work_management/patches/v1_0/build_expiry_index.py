@@ -0,0 +1,7 @@
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index import (
+    rebuild_expiry_index,
+)
+
+
+def execute():
+    rebuild_expiry_index()
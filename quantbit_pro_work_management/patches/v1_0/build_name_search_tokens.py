@@ -0,0 +1,6 @@
+from quantbit_pro_work_management.name_search import NAME_FIELDS, rebuild_name_tokens
+
+
+def execute():
+    for doctype in NAME_FIELDS:
+        rebuild_name_tokens(doctype)
@@ -0,0 +1,19 @@
+import frappe
+
+
+def execute():
+    frappe.db.sql(
+        """
+        UPDATE `tabSupporting Document`
+        SET attachment_status = 'Pending'
+        WHERE parenttype = 'Document Application'
+            AND IFNULL(attachment, '') != ''
+            AND IFNULL(attachment_status, '') = ''
+        """
+    )
+    frappe.enqueue(
+        "quantbit_pro_work_management.attachments.process_all_pending_attachments",
+        queue="long",
+        timeout=6 * 60 * 60,
+        enqueue_after_commit=True,
+    )
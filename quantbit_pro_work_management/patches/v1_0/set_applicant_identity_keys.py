@@ -0,0 +1,31 @@
+import frappe
+
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.applicant.applicant import (
+    get_identity_keys,
+)
+
+BATCH_SIZE = 5000
+
+
+def execute():
+    last_name = ""
+    while True:
+        applicants = frappe.db.sql(
+            """
+            SELECT name, passport_no, national_id, email, mobile
+            FROM `tabApplicant`
+            WHERE name > %(last_name)s
+            ORDER BY name
+            LIMIT %(limit)s
+            """,
+            {"last_name": last_name, "limit": BATCH_SIZE},
+            as_dict=True,
+        )
+        if not applicants:
+            break
+        frappe.db.bulk_update(
+            "Applicant",
+            {applicant.name: get_identity_keys(applicant) for applicant in applicants},
+            update_modified=False,
+        )
+        last_name = applicants[-1].name
@@ -0,0 +1,17 @@
+import frappe
+
+
+def execute():
+    # existing duplicates predate the constraint: only the latest Active document keeps the key
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application` app
+        INNER JOIN (
+            SELECT MAX(name) AS name
+            FROM `tabDocument Application`
+            WHERE status = 'Active' AND docstatus < 2
+            GROUP BY IFNULL(applicant, ''), document_type
+        ) latest ON latest.name = app.name
+        SET app.active_key = CONCAT(IFNULL(app.applicant, ''), '::', app.document_type)
+        """
+    )
@@ -0,0 +1,9 @@
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+    on_doctype_update,
+    rebuild_lineage,
+)
+
+
+def execute():
+    on_doctype_update()
+    rebuild_lineage()
@@ -0,0 +1,26 @@
+import frappe
+
+
+def execute():
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application`
+        SET effective_expiry_date = CASE transaction_type
+            WHEN 'Renewal' THEN new_expiry_date
+            WHEN 'Extension' THEN extended_date
+            ELSE expiry_date
+        END
+        """
+    )
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application` app
+        INNER JOIN `tabDocument Type` dt ON dt.name = app.document_type
+        SET app.next_reminder_date = IF(
+            IFNULL(dt.reminder_days_before_expiry, 0) > 0
+                AND app.effective_expiry_date IS NOT NULL,
+            DATE_SUB(app.effective_expiry_date, INTERVAL dt.reminder_days_before_expiry DAY),
+            NULL
+        )
+        """
+    )
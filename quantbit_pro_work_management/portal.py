@@ -0,0 +1,131 @@
+import hashlib
+
+import frappe
+from frappe.utils import date_diff, getdate, nowdate
+from werkzeug.wrappers import Response
+
+DOCUMENTS_CACHE_KEY = "pro_work_applicant_documents"
+USER_APPLICANTS_CACHE_KEY = "pro_work_user_applicants"
+PORTAL_DOCUMENT_FIELDS = [
+    "name",
+    "document_type",
+    "document_category",
+    "transaction_type",
+    "status",
+    "effective_expiry_date",
+]
+
+
+@frappe.whitelist()
+def get_applicant_documents(applicant=None):
+    """Documents of the session user's applicants (or one `applicant`) with days remaining.
+
+    Sends an ETag; a request whose If-None-Match still matches gets a 304 that
+    is answered from Redis alone.
+    """
+    applicants = get_accessible_applicants(applicant)
+    versions = [get_cached_documents(name)["version"] for name in applicants]
+    today = nowdate()
+    etag = '"{}"'.format(hashlib.sha1("|".join([today, *applicants, *versions]).encode()).hexdigest())
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if frappe.request and frappe.request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers=headers)
+    payload = {"applicants": [get_portal_documents(name, today) for name in applicants]}
+    return Response(
+        frappe.as_json({"message": payload}),
+        status=200,
+        headers=headers,
+        content_type="application/json",
+    )
+
+
+def get_accessible_applicants(applicant=None):
+    if frappe.session.user == "Guest":
+        raise frappe.PermissionError
+    applicants = get_user_applicants(frappe.session.user)
+    if not applicant:
+        return applicants
+    if applicant not in applicants:
+        frappe.has_permission("Applicant", "read", doc=applicant, throw=True)
+    return [applicant]
+
+
+def get_user_applicants(user):
+    """Applicants linked to a user by email or through their Employee record."""
+    applicants = frappe.cache.hget(USER_APPLICANTS_CACHE_KEY, user)
+    if applicants is None:
+        email = frappe.db.get_value("User", user, "email") or user
+        employees = frappe.get_all("Employee", filters={"user_id": user}, pluck="name")
+        or_filters = {"email": email}
+        if employees:
+            or_filters["employee"] = ["in", employees]
+        applicants = frappe.get_all("Applicant", or_filters=or_filters, pluck="name", order_by="name")
+        frappe.cache.hset(USER_APPLICANTS_CACHE_KEY, user, applicants)
+    return applicants
+
+
+def get_cached_documents(applicant):
+    cached = frappe.cache.hget(DOCUMENTS_CACHE_KEY, applicant)
+    if cached is None:
+        documents = frappe.get_all(
+            "Document Application",
+            filters={"applicant": applicant, "docstatus": ["<", 2]},
+            fields=PORTAL_DOCUMENT_FIELDS,
+            order_by="effective_expiry_date desc, name desc",
+        )
+        cached = {
+            "full_name": frappe.db.get_value("Applicant", applicant, "full_name"),
+            "documents": documents,
+            "version": hashlib.sha1(frappe.as_json(documents).encode()).hexdigest(),
+        }
+        frappe.cache.hset(DOCUMENTS_CACHE_KEY, applicant, cached)
+    return cached
+
+
+def get_portal_documents(applicant, today=None):
+    """The cached documents of `applicant` with days_remaining worked out for `today`."""
+    today = getdate(today or nowdate())
+    cached = get_cached_documents(applicant)
+    documents = []
+    for doc in cached["documents"]:
+        doc = frappe._dict(doc)
+        doc.days_remaining = (
+            date_diff(doc.effective_expiry_date, today) if doc.effective_expiry_date else None
+        )
+        documents.append(doc)
+    return {"applicant": applicant, "full_name": cached["full_name"], "documents": documents}
+
+
+def clear_applicant_documents_cache(applicants):
+    """Drop the cached documents now and again after commit, so a read racing the
+    transaction cannot leave the old list behind."""
+    applicants = {applicant for applicant in applicants if applicant}
+
+    def clear():
+        for applicant in applicants:
+            frappe.cache.hdel(DOCUMENTS_CACHE_KEY, applicant)
+
+    if applicants:
+        clear()
+        frappe.db.after_commit.add(clear)
+
+
+def on_document_application_change(doc, method=None):
+    """doc_events handler: drop the cached list of the (old and new) applicant."""
+    previous = doc.get_doc_before_save()
+    clear_applicant_documents_cache([doc.applicant, previous.applicant if previous else None])
+
+
+def on_applicant_change(doc, method=None):
+    """doc_events handler for Applicant and Employee: the user to applicant mapping may have changed.
+
+    Cleared now and again after commit, like the cached documents.
+    """
+
+    def clear():
+        frappe.cache.delete_value(USER_APPLICANTS_CACHE_KEY)
+
+    clear()
+    frappe.db.after_commit.add(clear)
+    if doc.doctype == "Applicant":
+        clear_applicant_documents_cache([doc.name])
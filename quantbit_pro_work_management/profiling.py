@@ -0,0 +1,175 @@
+import functools
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import add_to_date, cint, now_datetime
+
+
+def is_profiling_enabled():
+    """Read once per request / job; this is the only cost of a disabled profiler."""
+    enabled = getattr(frappe.local, "pro_work_profiling", None)
+    if enabled is None:
+        enabled = frappe.local.pro_work_profiling = bool(
+            frappe.db.get_single_value("Pro Work Settings", "enable_profiling", cache=True)
+        )
+    return enabled
+
+
+def profiled(scope):
+    """Decorator recording each call as `<scope>.<function name>`."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not is_profiling_enabled():
+                return fn(*args, **kwargs)
+            reference_name = getattr(args[0], "name", None) if args else None
+            with profile(f"{scope}.{fn.__name__}", reference_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profile(scope, reference_name=None):
+    """Record wall time and SQL query count / time of the block in Pro Work Profile Log.
+
+    Blocks nest; queries are counted in every enclosing block. Entries are
+    written in one bulk insert when the outermost block ends.
+    """
+    if not is_profiling_enabled():
+        yield
+        return
+    try:
+        with count_queries() as counter:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                duration = time.perf_counter() - start
+                frappe.local.pro_work_profile_entries.append(
+                    (scope, str(reference_name or "")[:140], duration * 1000, counter["count"], counter["time"] * 1000)
+                )
+    finally:
+        if not get_profile_stack():
+            flush_profile_entries()
+
+
+@contextmanager
+def count_queries():
+    """Count the SQL queries of the block and their time, whether or not profiling is enabled.
+
+    Yields {"count", "time"} (time in seconds); nested blocks all count.
+    """
+    stack = get_profile_stack()
+    if not stack:
+        install_query_counter()
+    counter = {"count": 0, "time": 0.0}
+    stack.append(counter)
+    try:
+        yield counter
+    finally:
+        stack.pop()
+        if not stack:
+            uninstall_query_counter()
+
+
+def get_profile_stack():
+    if not hasattr(frappe.local, "pro_work_profile_stack"):
+        frappe.local.pro_work_profile_stack = []
+        frappe.local.pro_work_profile_entries = []
+    return frappe.local.pro_work_profile_stack
+
+
+def install_query_counter():
+    original_sql = frappe.db.sql
+
+    @functools.wraps(original_sql)
+    def sql(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_sql(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            for counter in frappe.local.pro_work_profile_stack:
+                counter["count"] += 1
+                counter["time"] += elapsed
+
+    frappe.db.sql = sql
+
+
+def uninstall_query_counter():
+    frappe.db.__dict__.pop("sql", None)
+
+
+def flush_profile_entries():
+    entries = frappe.local.pro_work_profile_entries
+    frappe.local.pro_work_profile_entries = []
+    if not entries:
+        return
+    timestamp = now_datetime()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Pro Work Profile Log",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            "scope", "reference_name", "duration_ms", "query_count", "query_time_ms",
+        ],
+        [(frappe.generate_hash(length=12), timestamp, timestamp, user, user, *entry) for entry in entries],
+    )
+
+
+@frappe.whitelist()
+def get_profile_metrics(scope=None, hours=24):
+    """Calls, average, max and p50 / p95 of duration and query count per scope over the last `hours`.
+
+    Aggregated in SQL: one GROUP BY for the counts and one single-row
+    ORDER BY ... LIMIT 1 OFFSET lookup per percentile, so the cost does not
+    grow with the number of rows pulled into Python.
+    """
+    frappe.only_for("System Manager")
+    values = {"since": add_to_date(now_datetime(), hours=-cint(hours))}
+    condition = ""
+    if scope:
+        condition = "AND scope LIKE %(scope)s"
+        values["scope"] = f"{scope}%"
+    metrics = frappe.db.sql(
+        f"""
+        SELECT scope,
+            COUNT(*) AS calls,
+            AVG(duration_ms) AS avg_ms,
+            MAX(duration_ms) AS max_ms,
+            AVG(query_count) AS avg_queries,
+            MAX(query_count) AS max_queries
+        FROM `tabPro Work Profile Log`
+        WHERE creation >= %(since)s {condition}
+        GROUP BY scope
+        ORDER BY scope
+        """,
+        values,
+        as_dict=True,
+    )
+    for row in metrics:
+        for fieldname, suffix in (("duration_ms", "ms"), ("query_count", "queries"), ("query_time_ms", "query_ms")):
+            for pct in (50, 95):
+                row[f"p{pct}_{suffix}"] = get_percentile_value(fieldname, row.scope, values["since"], row.calls, pct)
+    return metrics
+
+
+def get_percentile_value(fieldname, scope, since, count, pct):
+    """Nearest-rank percentile of one column for one scope, read as a single row."""
+    rank = max(1, -(-count * pct // 100))
+    rows = frappe.db.sql(
+        f"""
+        SELECT `{fieldname}`
+        FROM `tabPro Work Profile Log`
+        WHERE scope = %(scope)s AND creation >= %(since)s
+        ORDER BY `{fieldname}`
+        LIMIT 1 OFFSET %(offset)s
+        """,
+        {"scope": scope, "since": since, "offset": int(rank) - 1},
+    )
+    return rows[0][0] if rows else None
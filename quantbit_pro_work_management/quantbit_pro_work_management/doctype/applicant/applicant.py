@@ -1,23 +1,36 @@
 # Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import re
+
 import frappe
+import phonenumbers
 from frappe.model.document import Document
 
+from quantbit_pro_work_management.master_data import get_employee
+
+# normalized column -> (source field, label); passport and ID numbers identify one person,
+# email and mobile are often shared within a family so they only warn
+IDENTITY_KEYS = {
+    "normalized_passport_no": ("passport_no", "Passport No"),
+    "normalized_national_id": ("national_id", "National ID"),
+    "normalized_email": ("email", "Email"),
+    "normalized_mobile": ("mobile", "Mobile"),
+}
+STRICT_IDENTITY_KEYS = ("normalized_passport_no", "normalized_national_id")
+
+
 class Applicant(Document):
     def validate(self):
         self.handle_applicant_type()
+        self.set_identity_keys()
+        self.check_duplicate_identity()
 
     def handle_applicant_type(self):
         if self.applicant_type == "Employee":
             if not self.employee:
                 frappe.throw("Employee is required when Applicant Type is Employee.")
-            employee = frappe.db.get_value(
-                "Employee",
-                self.employee,
-                ["employee_name", "date_of_birth", "gender"],
-                as_dict=True
-            )
+            employee = get_employee(self.employee)
             if not employee:
                 frappe.throw("Unable to fetch Employee details.")
             self.full_name = employee.employee_name
@@ -26,3 +39,96 @@ class Applicant(Document):
         elif self.applicant_type == "External":
             if not self.full_name:
                 frappe.throw("Full Name is required for External Applicant.")
+
+    def set_identity_keys(self):
+        self.update(get_identity_keys(self))
+
+    def check_duplicate_identity(self):
+        """Look up each changed identity key on its own index."""
+        if self.flags.ignore_duplicate_check:
+            return
+        previous = self.get_doc_before_save()
+        keys = {
+            fieldname: self.get(fieldname)
+            for fieldname in IDENTITY_KEYS
+            if self.get(fieldname) and (not previous or previous.get(fieldname) != self.get(fieldname))
+        }
+        for fieldname, duplicate in find_duplicate_applicants(keys, exclude=self.name).items():
+            label = IDENTITY_KEYS[fieldname][1]
+            message = f"{label} {self.get(IDENTITY_KEYS[fieldname][0])} is already registered for Applicant {duplicate}."
+            if fieldname in STRICT_IDENTITY_KEYS:
+                frappe.throw(message, frappe.DuplicateEntryError, title="Duplicate Applicant")
+            frappe.msgprint(message, title="Possible Duplicate Applicant", indicator="orange")
+
+
+def get_identity_keys(doc):
+    return {
+        "normalized_passport_no": normalize_document_number(doc.get("passport_no")),
+        "normalized_national_id": normalize_document_number(doc.get("national_id")),
+        "normalized_email": normalize_email(doc.get("email")),
+        "normalized_mobile": normalize_mobile(doc.get("mobile")),
+    }
+
+
+def normalize_document_number(value):
+    """Uppercase with spaces and dashes removed: "ab 12-345" -> "AB12345"."""
+    return re.sub(r"[\s\-]", "", value or "").upper() or None
+
+
+def normalize_email(value):
+    return (value or "").strip().lower() or None
+
+
+def normalize_mobile(value, region=None):
+    """E.164 where the number parses, digits with any leading + otherwise.
+
+    Numbers without a country code are read in `region`, by default the
+    country of the system settings.
+    """
+    value = re.sub(r"[^\d+]", "", value or "")
+    if value.startswith("00"):
+        value = "+" + value[2:]
+    if not value:
+        return None
+    try:
+        number = phonenumbers.parse(value, region or get_default_region())
+    except phonenumbers.NumberParseException:
+        return value
+    if not phonenumbers.is_possible_number(number):
+        return value
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def get_default_region():
+    country = frappe.db.get_default("country")
+    code = frappe.get_cached_value("Country", country, "code") if country else None
+    return code.upper() if code else None
+
+
+def find_duplicate_applicants(keys, exclude=None):
+    """Return {normalized field: applicant} for the keys already used by another applicant.
+
+    One query; every branch of the UNION is a single lookup on that column's index.
+    """
+    keys = {fieldname: value for fieldname, value in keys.items() if value}
+    if not keys:
+        return {}
+    queries = [
+        f"""(
+            SELECT '{fieldname}' AS fieldname, name
+            FROM `tabApplicant`
+            WHERE `{fieldname}` = %({fieldname})s AND name != %(exclude)s
+            LIMIT 1
+        )"""
+        for fieldname in keys
+    ]
+    return dict(
+        frappe.db.sql(" UNION ALL ".join(queries), {**keys, "exclude": exclude or ""})
+    )
+
+
+def enqueue_duplicate_scan():
+    """Scheduler: refresh the Duplicate Applicants prepared report in a background job."""
+    frappe.get_doc(
+        {"doctype": "Prepared Report", "report_name": "Duplicate Applicants", "filters": "{}"}
+    ).insert(ignore_permissions=True)
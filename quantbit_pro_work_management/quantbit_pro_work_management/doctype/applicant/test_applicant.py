@@ -1,9 +1,138 @@
 # Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import json
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from quantbit_pro_work_management.employee_sync import sync_employee
+from quantbit_pro_work_management.name_search import get_name_search_condition
+from quantbit_pro_work_management.portal import get_applicant_documents
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.applicant.applicant import (
+	normalize_document_number,
+	normalize_email,
+	normalize_mobile,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+	set_status_in_bulk,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.test_document_application import (
+	make_document_application,
+)
+
+
+def make_portal_user(email):
+	if not frappe.db.exists("User", email):
+		frappe.get_doc(
+			{"doctype": "User", "email": email, "first_name": "_Test Portal", "send_welcome_email": 0}
+		).insert(ignore_permissions=True)
+	return email
 
 
 class TestApplicant(FrappeTestCase):
-	pass
+	def test_identity_keys_are_normalized(self):
+		self.assertEqual(normalize_document_number(" ab 12-345 "), "AB12345")
+		self.assertEqual(normalize_email(" Jane.Doe@Example.COM "), "jane.doe@example.com")
+		self.assertEqual(normalize_mobile("050 123 4567", "AE"), "+971501234567")
+		self.assertEqual(normalize_mobile("00971 50-123-4567", "AE"), "+971501234567")
+		self.assertIsNone(normalize_document_number("  "))
+
+	def search(self, query):
+		condition, values = get_name_search_condition("Applicant", query)
+		return frappe.db.sql_list(f"SELECT name FROM `tabApplicant` WHERE {condition}", values)
+
+	def test_name_search_matches_prefixes_without_diacritics(self):
+		applicant = frappe.get_doc(
+			{"doctype": "Applicant", "applicant_type": "External", "full_name": "_Test José Müller-Żak"}
+		).insert()
+		for query in ("jose", "JOSÉ mül", "muller zak", "Za", "_test jos"):
+			self.assertIn(applicant.name, self.search(query), query)
+		for query in ("ose", "jose mullerx", "zakk"):
+			self.assertNotIn(applicant.name, self.search(query), query)
+
+	def test_sync_employee_updates_applicant_and_open_applications(self):
+		employee = "_T-EMP-SYNC-0001"
+		applicant = frappe.get_doc(
+			{"doctype": "Applicant", "applicant_type": "External", "full_name": "_Test Old Name"}
+		).insert()
+		open_application = make_document_application(applicant=applicant.name, submit=False)
+		closed_application = make_document_application(applicant=applicant.name, status="Active")
+		set_status_in_bulk([closed_application.name], "Expired")
+		# linked as if created for the employee, without needing an Employee record
+		frappe.db.set_value("Applicant", applicant.name, {"applicant_type": "Employee", "employee": employee})
+		frappe.db.set_value(
+			"Document Application",
+			{"name": ["in", [open_application.name, closed_application.name]]},
+			{"applicant_type": "Employee", "employee": employee},
+		)
+
+		sync_employee(employee, "_Test New Name", "1990-05-17", "Female")
+
+		self.assertEqual(
+			frappe.db.get_value("Applicant", applicant.name, ["full_name", "date_of_birth", "gender"]),
+			("_Test New Name", getdate("1990-05-17"), "Female"),
+		)
+		self.assertEqual(
+			frappe.db.get_value("Document Application", open_application.name, "applicant_full_name"),
+			"_Test New Name",
+		)
+		self.assertEqual(
+			frappe.db.get_value("Document Application", closed_application.name, "applicant_full_name"),
+			"_Test Old Name",
+		)
+		self.assertIn(applicant.name, self.search("_test new"))
+		self.assertNotIn(applicant.name, self.search("_test old"))
+
+	def get_documents(self, user, if_none_match=None, applicant=None):
+		"""get_applicant_documents as `user`, optionally with an If-None-Match request header."""
+		request = frappe._dict(headers={"If-None-Match": if_none_match} if if_none_match else {})
+		frappe.set_user(user)
+		try:
+			with patch.object(frappe.local, "request", request, create=True):
+				return get_applicant_documents(applicant)
+		finally:
+			frappe.set_user("Administrator")
+
+	def test_portal_etag(self):
+		user = make_portal_user("_test_portal_linked@example.com")
+		applicant = frappe.get_doc(
+			{"doctype": "Applicant", "applicant_type": "External", "full_name": "_Test Portal", "email": user}
+		).insert()
+		document = make_document_application(applicant=applicant.name)
+
+		response = self.get_documents(user)
+		etag = response.headers.get("ETag")
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(etag)
+		payload = json.loads(response.get_data())["message"]
+		self.assertEqual([row["applicant"] for row in payload["applicants"]], [applicant.name])
+		self.assertEqual([doc["name"] for doc in payload["applicants"][0]["documents"]], [document.name])
+
+		response = self.get_documents(user, if_none_match=etag)
+		self.assertEqual(response.status_code, 304)
+		self.assertEqual(response.get_data(), b"")
+
+		set_status_in_bulk([document.name], "Expired")
+		response = self.get_documents(user, if_none_match=etag)
+		self.assertEqual(response.status_code, 200)
+		self.assertNotEqual(response.headers.get("ETag"), etag)
+
+	def test_portal_hides_unlinked_applicants(self):
+		applicant = frappe.get_doc(
+			{
+				"doctype": "Applicant",
+				"applicant_type": "External",
+				"full_name": "_Test Portal Other",
+				"email": "_test_portal_other@example.com",
+			}
+		).insert()
+		make_document_application(applicant=applicant.name)
+		user = make_portal_user("_test_portal_unlinked@example.com")
+
+		response = self.get_documents(user)
+		self.assertEqual(json.loads(response.get_data())["message"], {"applicants": []})
+		with self.assertRaises(frappe.PermissionError):
+			self.get_documents(user, applicant=applicant.name)
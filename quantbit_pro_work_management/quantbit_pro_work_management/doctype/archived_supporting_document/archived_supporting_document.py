@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ArchivedSupportingDocument(Document):
+	pass
+
+
+def on_doctype_update():
+	# attachments.remove_unreferenced_file; Attach is a text column, so the index is on a prefix
+	frappe.db.add_index("Archived Supporting Document", ["attachment(140)"], "attachment_index")
@@ -3,17 +3,155 @@
 
 import frappe
 from frappe.model.document import Document
-from frappe.utils import add_days
+from frappe.utils import add_days, now_datetime
+
+from quantbit_pro_work_management.master_data import (
+    get_document_category,
+    get_document_type,
+    get_employee,
+)
+from quantbit_pro_work_management.portal import clear_applicant_documents_cache
+from quantbit_pro_work_management.profiling import profiled
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup import (
+    apply_rollup_deltas,
+    get_rollup_key,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket import (
+    apply_bucket_deltas,
+    get_bucket_key,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index import (
+    LIVE_STATUSES,
+    delete_document_application_entries,
+    refresh_document_application_entries,
+    update_entry_reminder_dates,
+)
+
+DUPLICATE_ACTIVE_MESSAGE = "Another Active document already exists for this applicant and document type."
+PREVIOUS_DOCUMENT_FIELDS = [
+    "name",
+    "docstatus",
+    "status",
+    "document_type",
+    "expiry_date",
+    "root_document",
+    "chain_depth",
+]
+LINEAGE_FIELDS = [
+    "name",
+    "transaction_type",
+    "document_type",
+    "status",
+    "posting_date",
+    "issue_date",
+    "effective_expiry_date",
+    "root_document",
+    "chain_depth",
+    "is_head",
+]
+
+
+class LifecycleContext:
+    """What one save / submit of a Document Application reads, each loaded at most once.
+
+    Query budget per save on a warm cache:
+    - Document Type, Document Category, Employee: 0 (master data cache)
+    - previous document (Renewal / Extension): 1, narrow projection
+    - latest active chain head (auto-fetch, only when no previous link is set): 1
+    - other Active document check: 0, enforced by the unique active_key index
+    On submit of a Renewal / Extension the previous document's status change
+    adds one locking SELECT and one UPDATE plus its Version and rollup rows,
+    and one UPDATE moving the chain head.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.latest_active = {}
+
+    def get_document_type(self, name):
+        return get_document_type(name)
+
+    def get_document_category(self, name):
+        return get_document_category(name)
+
+    def get_employee(self, employee):
+        return get_employee(employee)
+
+    def get_document(self, name):
+        if name not in self.documents:
+            self.documents[name] = frappe.db.get_value(
+                "Document Application", name, PREVIOUS_DOCUMENT_FIELDS, as_dict=True
+            )
+        return self.documents[name]
+
+    def get_latest_active(self, applicant, document_type):
+        key = (applicant, document_type)
+        if key not in self.latest_active:
+            previous = frappe.get_all(
+                "Document Application",
+                filters={
+                    "applicant": applicant,
+                    "document_type": document_type,
+                    "is_head": 1,
+                    "docstatus": 1,
+                    "status": ["in", ["Active", "Issued"]],
+                },
+                fields=PREVIOUS_DOCUMENT_FIELDS,
+                order_by="creation desc",
+                limit=1,
+            )
+            self.latest_active[key] = previous[0] if previous else None
+            if previous:
+                self.documents[previous[0].name] = previous[0]
+        return self.latest_active[key]
+
 
 class DocumentApplication(Document):
+    def get_context(self):
+        """The bulk import snapshot if one is set, else this save's LifecycleContext."""
+        if self.flags.import_snapshot:
+            return self.flags.import_snapshot
+        if not self.flags.lifecycle_context:
+            self.flags.lifecycle_context = LifecycleContext()
+        return self.flags.lifecycle_context
+
+    @profiled("Document Application")
     def before_save(self):
         self.calculate_expiry()
         self.calculate_supporting_doc_expiry()
+        self.set_expiry_tracking_dates()
+
+    @profiled("Document Application")
+    def before_update_after_submit(self):
+        self.flags.lifecycle_context = None
+        self.set_expiry_tracking_dates()
+        self.set_active_key()
+
+    @profiled("Document Application")
+    def before_submit(self):
+        # submitting a new document directly (e.g. bulk renewal) skips before_save
+        self.calculate_expiry()
+        self.calculate_supporting_doc_expiry()
+        self.set_expiry_tracking_dates()
+        self.set_lineage()
 
+    @profiled("Document Application")
     def on_submit(self):
         self.update_previous_document_status()
 
+    def before_cancel(self):
+        self.is_head = 0
+        self.active_key = None
+
+    def on_cancel(self):
+        # successors link to this document, so only a chain head can be cancelled
+        previous = self.get_previous_document()
+        if previous and previous.docstatus == 1:
+            set_chain_heads([previous.name], 1)
+
+    @profiled("Document Application")
     def validate(self):
+        self.flags.lifecycle_context = None
         self.auto_fetch_previous_document()
         if self.allow_expiry_override and not self.override_reason:
             frappe.throw("Override Reason is required when Expiry Override is enabled.")
@@ -22,53 +160,56 @@ class DocumentApplication(Document):
         self.set_employee_personal_details()
         self.validate_master_data()
         self.validate_transaction_rules()
-        self.prevent_duplicate_active()
+        self.set_active_key()
         self.validate_expiry_dates()
 
+    @profiled("Document Application")
     def set_employee_personal_details(self):
         if self.applicant_type != "Employee" or not self.employee:
             return
-        employee = frappe.db.get_value(
-            "Employee",
-            self.employee,
-            ["date_of_birth", "gender"],
-            as_dict=True
-        )
+        employee = self.get_employee_details()
         if not employee:
             frappe.throw("Unable to fetch Employee details.")
         self.date_of_birth = employee.date_of_birth
         self.gender = employee.gender
 
+    @profiled("Document Application")
     def set_employee_name(self):
         if self.applicant_type != "Employee":
             return
         if not self.employee:
             frappe.throw("Employee is required when Applicant Type is Employee.")
-        name = frappe.db.get_value("Employee", self.employee, "employee_name")
-        if not name:
+        employee = self.get_employee_details()
+        if not employee or not employee.employee_name:
             frappe.throw("Unable to fetch Employee Name.")
-        self.applicant_full_name = name
+        self.applicant_full_name = employee.employee_name
+
+    def get_employee_details(self):
+        return self.get_context().get_employee(self.employee)
 
+    @profiled("Document Application")
     def set_document_category(self):
         if not self.document_type:
             return
-        category = frappe.db.get_value(
-            "Document Type", self.document_type, "document_category"
-        )
+        doc_type = self.get_context().get_document_type(self.document_type)
+        category = doc_type.document_category if doc_type else None
         if not category:
             frappe.throw(
                 f"Document Category is not defined in Document Type {self.document_type}"
             )
         self.document_category = category
 
+    @profiled("Document Application")
     def validate_master_data(self):
         if self.document_category:
-            category = frappe.get_doc("Document Category", self.document_category)
-            if not category.is_active:
+            category = self.get_context().get_document_category(self.document_category)
+            if category and not category.is_active:
                 frappe.throw("Selected Document Category is inactive.")
         if not self.document_type:
             return
-        doc_type = frappe.get_doc("Document Type", self.document_type)
+        doc_type = self.get_context().get_document_type(self.document_type)
+        if not doc_type:
+            frappe.throw(f"Document Type {self.document_type} does not exist.")
         if not doc_type.is_active:
             frappe.throw("Selected Document Type is inactive.")
         if self.document_category and doc_type.document_category != self.document_category:
@@ -76,6 +217,7 @@ class DocumentApplication(Document):
         if self.transaction_type == "Renewal" and not doc_type.renewal_allowed:
             frappe.throw("Renewal is not allowed for this Document Type.")
 
+    @profiled("Document Application")
     def validate_transaction_rules(self):
         if self.transaction_type not in ["Renewal", "Extension"]:
             return
@@ -95,11 +237,14 @@ class DocumentApplication(Document):
 
     def get_previous_document(self):
         if self.transaction_type == "Renewal":
-            return frappe.get_doc("Document Application", self.previous_document)
-        if self.transaction_type == "Extension":
-            return frappe.get_doc("Document Application", self.previous_referred_document)
-        return None
+            name = self.previous_document
+        elif self.transaction_type == "Extension":
+            name = self.previous_referred_document
+        else:
+            return None
+        return self.get_context().get_document(name)
 
+    @profiled("Document Application")
     def auto_fetch_previous_document(self):
         if self.transaction_type not in ["Renewal", "Extension"]:
             return
@@ -110,27 +255,17 @@ class DocumentApplication(Document):
         link_field, expiry_field = field_map[self.transaction_type]
         if self.get(link_field):
             return
-        previous = frappe.get_all(
-            "Document Application",
-            filters={
-                "applicant": self.applicant,
-                "document_type": self.document_type,
-                "docstatus": 1,
-                "status": ["in", ["Active", "Issued"]],
-            },
-            fields=["name", "expiry_date"],
-            order_by="creation desc",
-            limit=1,
-        )
+        previous = self.get_context().get_latest_active(self.applicant, self.document_type)
         if previous:
-            self.set(link_field, previous[0].name)
-            self.set(expiry_field, previous[0].expiry_date)
+            self.set(link_field, previous.name)
+            self.set(expiry_field, previous.expiry_date)
 
+    @profiled("Document Application")
     def calculate_expiry(self):
         if self.allow_expiry_override or self.status != "Issued" or not self.document_type:
             return
-        doc_type = frappe.get_doc("Document Type", self.document_type)
-        if not doc_type.has_expiry:
+        doc_type = self.get_context().get_document_type(self.document_type)
+        if not doc_type or not doc_type.has_expiry:
             self.expiry_date = None
             self.new_expiry_date = None
             return
@@ -146,44 +281,386 @@ class DocumentApplication(Document):
         self.expiry_date = previous.expiry_date
         self.new_expiry_date = add_days(previous.expiry_date, validity)
 
+    @profiled("Document Application")
     def calculate_supporting_doc_expiry(self):
         for row in self.supporting_document:
             if not row.document_type or not row.issue_date:
                 continue
-            doc_type = frappe.get_doc("Document Type", row.document_type)
-            if not doc_type.has_expiry:
+            doc_type = self.get_context().get_document_type(row.document_type)
+            if not doc_type or not doc_type.has_expiry:
                 row.expiry_date = None
                 continue
             if not doc_type.validity_days:
                 frappe.throw(f"Validity Days not defined for {row.document_type}")
             row.expiry_date = add_days(row.issue_date, doc_type.validity_days - 1)
 
-    def prevent_duplicate_active(self):
-        if self.status != "Active":
-            return
-        exists = frappe.get_all(
-            "Document Application",
-            filters={
-                "applicant": self.applicant,
-                "document_type": self.document_type,
-                "status": "Active",
-                "name": ["!=", self.name],
-            },
+    @profiled("Document Application")
+    def set_expiry_tracking_dates(self):
+        self.effective_expiry_date = get_effective_expiry_date(self)
+        if not self.is_new() and self.has_value_changed("effective_expiry_date"):
+            clear_reminder_ledger(self.name)
+        self.next_reminder_date = get_next_reminder_date(
+            self.effective_expiry_date, self.document_type
         )
-        if exists:
-            frappe.throw(
-                "Another Active document already exists for this applicant and document type."
-            )
 
+    @profiled("Document Application")
+    def set_lineage(self):
+        """Place this document in its renewal / extension chain as the new head."""
+        previous = self.get_previous_document()
+        if previous:
+            self.root_document = previous.root_document or previous.name
+            self.chain_depth = (previous.chain_depth or 0) + 1
+        else:
+            self.root_document = self.name
+            self.chain_depth = 0
+        self.is_head = 1
+
+    def set_active_key(self):
+        """At most one Active document per applicant and document type, enforced by the
+        unique index on active_key; see show_unique_validation_message."""
+        self.active_key = (
+            get_active_key(self.applicant, self.document_type) if self.status == "Active" else None
+        )
+
+    def show_unique_validation_message(self, e):
+        if "active_key" in str(e):
+            frappe.throw(DUPLICATE_ACTIVE_MESSAGE, frappe.UniqueValidationError)
+        super().show_unique_validation_message(e)
+
+    @profiled("Document Application")
     def validate_expiry_dates(self):
         if self.issue_date and self.expiry_date and self.expiry_date <= self.issue_date:
             frappe.throw("Expiry Date must be after Issue Date.")
 
+    @profiled("Document Application")
     def update_previous_document_status(self):
         if self.transaction_type not in ["Renewal", "Extension"]:
             return
+        if self.flags.defer_previous_status_update:
+            return
         previous = self.get_previous_document()
+        if not previous:
+            return
+        set_chain_heads([previous.name], 0)
         if previous.status not in ["Active", "Issued"]:
             return
-        previous.status = "Renewed" if self.transaction_type == "Renewal" else "Extended"
-        previous.save(ignore_permissions=True)
+        set_status_in_bulk(
+            [previous.name], "Renewed" if self.transaction_type == "Renewal" else "Extended"
+        )
+        clear_reminder_ledger(previous.name)
+
+
+HOT_QUERY_INDEXES = {
+    # bulk import snapshot of Active / Issued documents
+    "applicant_document_type_status_index": ["applicant", "document_type", "status", "docstatus"],
+    # auto-fetch of the previous document and get_chain_heads
+    "applicant_is_head_document_type_index": ["applicant", "is_head", "document_type"],
+    # get_document_chain
+    "root_document_chain_depth_index": ["root_document", "chain_depth"],
+    # archive: a chain is only archived once nothing outside it renews, extends or amends it
+    "previous_document_index": ["previous_document"],
+    "previous_referred_document_index": ["previous_referred_document"],
+    "amended_from_index": ["amended_from"],
+    # Document Application Report
+    "posting_date_name_index": ["posting_date", "name"],
+}
+
+
+def on_doctype_update():
+    for index_name, fields in HOT_QUERY_INDEXES.items():
+        frappe.db.add_index("Document Application", fields, index_name)
+
+
+def get_active_key(applicant, document_type):
+    return f"{applicant or ''}::{document_type}"
+
+
+def get_effective_expiry_date(doc):
+    if doc.transaction_type == "Renewal":
+        return doc.new_expiry_date
+    elif doc.transaction_type == "Extension":
+        return doc.extended_date
+    return doc.expiry_date
+
+
+def get_next_reminder_date(effective_expiry_date, document_type):
+    if not effective_expiry_date or not document_type:
+        return None
+    doc_type = get_document_type(document_type)
+    if not doc_type or not doc_type.reminder_thresholds:
+        return None
+    return add_days(effective_expiry_date, -doc_type.reminder_thresholds[0])
+
+
+def clear_reminder_ledger(docname):
+    frappe.db.delete("Document Reminder Ledger", {"document_application": docname})
+
+
+class AggregateDeltas:
+    """Rollup and expiry bucket deltas collected over several bulk status changes.
+
+    A long transaction collects them and applies them just before it commits,
+    so the shared aggregate rows stay locked only briefly.
+    """
+
+    def __init__(self):
+        self.rollup = []
+        self.bucket = []
+
+    def apply(self):
+        apply_rollup_deltas(self.rollup)
+        apply_bucket_deltas(self.bucket)
+        self.rollup, self.bucket = [], []
+
+
+def set_status_in_bulk(docnames, status, from_statuses=("Active", "Issued"), aggregate_deltas=None):
+    """Set-based status change that skips the save lifecycle.
+
+    Only rows currently in `from_statuses` are changed. Writes the Version,
+    rollup, expiry bucket and expiry index rows a save would have written,
+    drops the portal cache of the applicants and returns the changed names.
+    Given `aggregate_deltas`, the rollup and bucket deltas are left there for
+    the caller to apply.
+    """
+    if not docnames:
+        return []
+    documents = frappe.db.sql(
+        """
+        SELECT name, applicant, docstatus, status, posting_date, document_category, document_type,
+            transaction_type, effective_expiry_date
+        FROM `tabDocument Application`
+        WHERE name IN %(names)s
+            AND status IN %(from_statuses)s
+        FOR UPDATE
+        """,
+        {"names": docnames, "from_statuses": from_statuses},
+        as_dict=True,
+    )
+    if not documents:
+        return []
+    names = [doc.name for doc in documents]
+    timestamp = now_datetime()
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application`
+        SET status = %(status)s,
+            active_key = IF(%(status)s = 'Active', CONCAT(IFNULL(applicant, ''), '::', document_type), NULL),
+            modified = %(modified)s,
+            modified_by = %(user)s
+        WHERE name IN %(names)s
+        """,
+        {"names": names, "status": status, "modified": timestamp, "user": frappe.session.user},
+    )
+    create_status_versions({doc.name: doc.status for doc in documents}, status, timestamp)
+    deltas = aggregate_deltas or AggregateDeltas()
+    for doc in documents:
+        deltas.rollup.append((get_rollup_key(doc), -1))
+        deltas.bucket.append((get_bucket_key(doc), -1))
+        doc.status = status
+        deltas.rollup.append((get_rollup_key(doc), 1))
+        deltas.bucket.append((get_bucket_key(doc), 1))
+    if aggregate_deltas is None:
+        deltas.apply()
+    if status in LIVE_STATUSES:
+        refresh_document_application_entries(names)
+    else:
+        delete_document_application_entries(names)
+    clear_applicant_documents_cache([doc.applicant for doc in documents])
+    return names
+
+
+def create_status_versions(previous_status, new_status, timestamp):
+    """Bulk insert Version rows recording a status change, as track_changes would."""
+    user = frappe.session.user
+    values = [
+        (
+            frappe.generate_hash(length=10), timestamp, timestamp, user, user,
+            "Document Application", docname,
+            frappe.as_json({
+                "changed": [["status", old_status, new_status]],
+                "added": [],
+                "removed": [],
+                "row_changed": [],
+            }),
+        )
+        for docname, old_status in previous_status.items()
+    ]
+    frappe.db.bulk_insert(
+        "Version",
+        ["name", "creation", "modified", "owner", "modified_by", "ref_doctype", "docname", "data"],
+        values,
+    )
+
+
+def set_chain_heads(docnames, is_head):
+    if not docnames:
+        return
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application`
+        SET is_head = %(is_head)s
+        WHERE name IN %(names)s
+        """,
+        {"names": docnames, "is_head": is_head},
+    )
+
+
+@frappe.whitelist()
+def get_document_chain(name):
+    """Every submitted document in the renewal / extension chain of `name` that the
+    user may read, root first.
+
+    Read through get_list, so user permissions apply to each member. Archived
+    members are included with archived = 1 for users who can read the archive.
+    """
+    if frappe.db.exists("Document Application", name):
+        frappe.has_permission("Document Application", "read", doc=name, throw=True)
+        root = frappe.db.get_value("Document Application", name, "root_document")
+    else:
+        frappe.has_permission("Document Application Archive", "read", throw=True)
+        root = frappe.db.get_value("Document Application Archive", name, "root_document")
+    if not root:
+        return []
+    chain = frappe.get_list(
+        "Document Application",
+        filters={"root_document": root, "docstatus": 1},
+        fields=[*LINEAGE_FIELDS, "creation"],
+    )
+    for row in chain:
+        row.archived = 0
+    if frappe.has_permission("Document Application Archive", "read"):
+        archived = frappe.get_list(
+            "Document Application Archive",
+            filters={"root_document": root, "original_docstatus": 1},
+            fields=[*(fieldname for fieldname in LINEAGE_FIELDS if fieldname != "is_head"), "creation"],
+        )
+        for row in archived:
+            row.update({"is_head": 0, "archived": 1})
+        chain.extend(archived)
+    return sorted(chain, key=lambda row: (row.chain_depth or 0, row.creation))
+
+
+@frappe.whitelist()
+def get_chain_heads(applicant):
+    """The current (latest submitted) document of each chain held by `applicant`."""
+    return frappe.get_list(
+        "Document Application",
+        filters={"applicant": applicant, "is_head": 1, "docstatus": 1},
+        fields=LINEAGE_FIELDS,
+        order_by="document_type",
+    )
+
+
+def rebuild_lineage():
+    """Derive root_document, chain_depth and is_head for all submitted documents.
+
+    Roots are set first and then pushed down the chains one level per UPDATE.
+    A document whose previous document is missing or not submitted starts a
+    chain of its own.
+    """
+    previous_link = """CASE child.transaction_type
+        WHEN 'Renewal' THEN child.previous_document
+        WHEN 'Extension' THEN child.previous_referred_document
+    END"""
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application`
+        SET root_document = NULL, chain_depth = 0, is_head = 0
+        """
+    )
+    while True:
+        frappe.db.sql(
+            f"""
+            UPDATE `tabDocument Application` child
+            LEFT JOIN `tabDocument Application` parent ON parent.name = {previous_link}
+            SET child.root_document = child.name, child.chain_depth = 0
+            WHERE child.docstatus = 1
+                AND child.root_document IS NULL
+                AND (parent.name IS NULL OR parent.docstatus != 1)
+            """
+        )
+        if not frappe.db.sql("SELECT ROW_COUNT()")[0][0]:
+            break
+        while True:
+            frappe.db.sql(
+                f"""
+                UPDATE `tabDocument Application` child
+                INNER JOIN `tabDocument Application` parent ON parent.name = {previous_link}
+                SET child.root_document = parent.root_document,
+                    child.chain_depth = parent.chain_depth + 1
+                WHERE child.docstatus = 1
+                    AND child.root_document IS NULL
+                    AND parent.root_document IS NOT NULL
+                """
+            )
+            if not frappe.db.sql("SELECT ROW_COUNT()")[0][0]:
+                break
+    frappe.db.sql(
+        """
+        UPDATE `tabDocument Application`
+        SET is_head = 1
+        WHERE docstatus = 1
+        """
+    )
+    frappe.db.sql(
+        f"""
+        UPDATE `tabDocument Application` parent
+        INNER JOIN `tabDocument Application` child ON {previous_link} = parent.name
+        SET parent.is_head = 0
+        WHERE child.docstatus = 1
+        """
+    )
+
+
+def update_next_reminder_dates(document_type, thresholds):
+    """Re-derive stored reminder dates, on the applications and in the Expiry Index,
+    after a Document Type's reminder thresholds (largest first) change.
+
+    An application resumes at the largest threshold below the smallest one
+    already sent (Document Reminder Ledger), so a change to the thresholds
+    does not rewind it to the first reminder. Other index entries restart at
+    the largest threshold; the outbox dedup key keeps those from repeating.
+    """
+    update_entry_reminder_dates(thresholds[0] if thresholds else None, document_type=document_type)
+    sent_reminders = """
+        LEFT JOIN (
+            SELECT document_application, MIN(threshold_days) AS sent_days
+            FROM `tabDocument Reminder Ledger`
+            GROUP BY document_application
+        ) ledger ON ledger.document_application = {reference}
+    """
+    frappe.db.sql(
+        f"""
+        UPDATE `tabDocument Application` application
+        {sent_reminders.format(reference="application.name")}
+        SET application.next_reminder_date = {get_next_reminder_date_sql(thresholds, "application.effective_expiry_date")}
+        WHERE application.document_type = %(document_type)s
+        """,
+        {"document_type": document_type},
+    )
+    next_reminder_date = get_next_reminder_date_sql(thresholds, "entry.expiry_date")
+    frappe.db.sql(
+        f"""
+        UPDATE `tabExpiry Index` entry
+        {sent_reminders.format(reference="entry.reference_name")}
+        SET entry.next_reminder_date = {next_reminder_date},
+            entry.due_date = IFNULL({next_reminder_date}, DATE_ADD(entry.expiry_date, INTERVAL 1 DAY))
+        WHERE entry.reference_doctype = 'Document Application'
+            AND entry.document_type = %(document_type)s
+            AND entry.due_date IS NOT NULL
+            AND ledger.sent_days IS NOT NULL
+        """,
+        {"document_type": document_type},
+    )
+
+
+def get_next_reminder_date_sql(thresholds, expiry_date_column):
+    """CASE picking the largest threshold below `ledger.sent_days`, or NULL when none is left."""
+    if not thresholds:
+        return "NULL"
+    branches = "".join(
+        f" WHEN ledger.sent_days IS NULL OR ledger.sent_days > {days}"
+        f" THEN DATE_SUB({expiry_date_column}, INTERVAL {days} DAY)"
+        for days in map(int, thresholds)
+    )
+    return f"(CASE{branches} END)"
@@ -0,0 +1,79 @@
+// Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+// For license information, please see license.txt
+
+frappe.listview_settings["Document Application"] = {
+    onload: function(listview) {
+        listview.page.add_action_item(__("Renew"), function() {
+            bulk_renew(listview, "Renewal");
+        });
+        listview.page.add_action_item(__("Extend"), function() {
+            frappe.prompt(
+                {
+                    fieldname: "extended_date",
+                    label: __("Extended Date"),
+                    fieldtype: "Date",
+                    reqd: 1
+                },
+                function(values) {
+                    bulk_renew(listview, "Extension", values.extended_date);
+                },
+                __("Extend Documents")
+            );
+        });
+    }
+};
+
+function bulk_renew(listview, transaction_type, extended_date) {
+    const names = listview.get_checked_items(true);
+    if (!names.length) {
+        return;
+    }
+    frappe.call({
+        method: "quantbit_pro_work_management.bulk_renewal.bulk_renew",
+        args: {
+            names: names,
+            transaction_type: transaction_type,
+            extended_date: extended_date
+        },
+        freeze: true,
+        callback: function(r) {
+            const result = r.message || {};
+            if (result.job_id) {
+                frappe.show_alert(__("{0} documents queued", [names.length]));
+                wait_for_bulk_renewal(listview, transaction_type, result.job_id);
+                return;
+            }
+            show_bulk_renewal_result(listview, transaction_type, result);
+        }
+    });
+}
+
+function wait_for_bulk_renewal(listview, transaction_type, job_id) {
+    const handler = function(data) {
+        if (data.job_id !== job_id) {
+            return;
+        }
+        frappe.realtime.off("document_application_renewal_complete", handler);
+        frappe.call({
+            method: "quantbit_pro_work_management.bulk_import.get_import_result",
+            args: { job_id: job_id },
+            callback: function(r) {
+                if (r.message) {
+                    show_bulk_renewal_result(listview, transaction_type, r.message);
+                }
+            }
+        });
+    };
+    frappe.realtime.on("document_application_renewal_complete", handler);
+}
+
+function show_bulk_renewal_result(listview, transaction_type, result) {
+    let message = __("{0} of {1} documents processed", [result.inserted.length, result.total]);
+    if (result.errors.length) {
+        message += "<br><br>" + result.errors
+            .map(e => `${frappe.utils.escape_html(e.previous)}: ${frappe.utils.escape_html(e.error)}`)
+            .join("<br>");
+    }
+    frappe.msgprint(message, __("Bulk {0}", [__(transaction_type)]));
+    listview.refresh();
+}
@@ -1,9 +1,322 @@
 # Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import os
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime, nowdate
+
+from quantbit_pro_work_management.attachments import process_pending_attachments, remove_unreferenced_file
+from quantbit_pro_work_management.bulk_import import import_document_applications
+from quantbit_pro_work_management.bulk_renewal import run_bulk_renewal
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+	DUPLICATE_ACTIVE_MESSAGE,
+	HOT_QUERY_INDEXES,
+	set_status_in_bulk,
+)
+
+PLAN_ROWS = 2000
+TEST_CATEGORY = "_Test Document Category"
+TEST_DOCUMENT_TYPE = "_Test Document Type"
+
+
+def make_document_type(name=TEST_DOCUMENT_TYPE, **kwargs):
+	if not frappe.db.exists("Document Category", TEST_CATEGORY):
+		frappe.get_doc(
+			{"doctype": "Document Category", "category_name": TEST_CATEGORY, "category_code": "_TDC"}
+		).insert()
+	if not frappe.db.exists("Document Type", name):
+		frappe.get_doc(
+			{
+				"doctype": "Document Type",
+				"document_type_name": name,
+				"document_category": TEST_CATEGORY,
+				"validity_days": 365,
+				"reminder_days_before_expiry": 30,
+				**kwargs,
+			}
+		).insert()
+	return name
+
+
+def make_applicant(full_name="_Test Applicant"):
+	return frappe.get_doc(
+		{"doctype": "Applicant", "applicant_type": "External", "full_name": full_name}
+	).insert()
+
+
+def make_document_application(applicant=None, submit=True, **kwargs):
+	"""An Issued New Application for `applicant`, submitted unless submit=False."""
+	doc = frappe.get_doc(
+		{
+			"doctype": "Document Application",
+			"applicant_type": "External",
+			"applicant": applicant or make_applicant().name,
+			"document_type": make_document_type(),
+			"transaction_type": "New Application",
+			"posting_date": nowdate(),
+			"issue_date": nowdate(),
+			"status": "Issued",
+			**kwargs,
+		}
+	).insert()
+	if submit:
+		doc.submit()
+	return doc
 
 
 class TestDocumentApplication(FrappeTestCase):
-	pass
+	@classmethod
+	def setUpClass(cls):
+		"""Seed enough rows that a full scan is never the cheapest plan; rolled back after the class."""
+		super().setUpClass()
+		timestamp = now_datetime()
+		frappe.db.bulk_insert(
+			"Document Application",
+			[
+				"name",
+				"creation",
+				"modified",
+				"owner",
+				"modified_by",
+				"docstatus",
+				"status",
+				"applicant",
+				"document_type",
+				"posting_date",
+				"root_document",
+				"chain_depth",
+				"is_head",
+			],
+			[
+				(
+					f"_Test Plan {i:05d}",
+					timestamp,
+					timestamp,
+					"Administrator",
+					"Administrator",
+					1,
+					"Active",
+					f"_Test Plan Applicant {i // 10}",
+					f"_Test Plan Type {i % 2}",
+					add_days("2020-01-01", i),
+					f"_Test Plan {i - i % 5:05d}",
+					i % 5,
+					int(i % 5 == 4),
+				)
+				for i in range(PLAN_ROWS)
+			],
+		)
+
+	def assert_uses_index(self, query, index_name):
+		"""EXPLAIN `query` and check the optimizer picks `index_name` on Document Application."""
+		plan = frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+		rows = [row for row in plan if row.table in ("tabDocument Application", "`tabDocument Application`")]
+		self.assertTrue(rows, f"Document Application not in plan: {plan}")
+		for row in rows:
+			self.assertNotEqual(row.type, "ALL", f"Full scan: {row}")
+			self.assertEqual(row.key, index_name, f"Unexpected index: {row}")
+
+	def test_hot_query_indexes_exist(self):
+		indexes = {
+			row.Key_name for row in frappe.db.sql("SHOW INDEX FROM `tabDocument Application`", as_dict=True)
+		}
+		for index_name in HOT_QUERY_INDEXES:
+			self.assertIn(index_name, indexes)
+
+	def test_previous_document_lookup_plan(self):
+		query = frappe.get_all(
+			"Document Application",
+			filters={
+				"applicant": "_Test Plan Applicant 7",
+				"document_type": "_Test Plan Type 1",
+				"is_head": 1,
+				"docstatus": 1,
+				"status": ["in", ["Active", "Issued"]],
+			},
+			fields=["name", "expiry_date"],
+			order_by="creation desc",
+			limit=1,
+			run=0,
+		)
+		self.assert_uses_index(query, "applicant_is_head_document_type_index")
+
+	def test_chain_heads_plan(self):
+		query = frappe.get_all(
+			"Document Application",
+			filters={"applicant": "_Test Plan Applicant 7", "is_head": 1, "docstatus": 1},
+			fields=["name"],
+			order_by="document_type",
+			run=0,
+		)
+		self.assert_uses_index(query, "applicant_is_head_document_type_index")
+
+	def test_document_chain_plan(self):
+		self.assert_uses_index(
+			"""
+			SELECT name FROM `tabDocument Application`
+			WHERE root_document = '_Test Plan 00070' AND docstatus = 1
+			ORDER BY chain_depth
+			""",
+			"root_document_chain_depth_index",
+		)
+
+	def test_active_key_is_unique(self):
+		rows = frappe.db.sql(
+			"SHOW INDEX FROM `tabDocument Application` WHERE Column_name = 'active_key'", as_dict=True
+		)
+		self.assertTrue(any(not row.Non_unique for row in rows))
+
+	def test_second_active_document_is_rejected(self):
+		first = make_document_application(status="Active")
+		with self.assertRaises(frappe.UniqueValidationError) as raised:
+			make_document_application(applicant=first.applicant, status="Active")
+		self.assertIn(DUPLICATE_ACTIVE_MESSAGE, str(raised.exception))
+
+	def test_closed_predecessor_does_not_block_active_document(self):
+		for status in ("Expired", "Renewed"):
+			previous = make_document_application(status="Active")
+			set_status_in_bulk([previous.name], status)
+			doc = make_document_application(applicant=previous.applicant, status="Active")
+			self.assertTrue(doc.active_key)
+			self.assertIsNone(frappe.db.get_value("Document Application", previous.name, "active_key"))
+
+	def test_report_plan(self):
+		self.assert_uses_index(
+			"""
+			SELECT name FROM `tabDocument Application`
+			WHERE posting_date >= '2021-01-01' AND posting_date <= '2021-01-31'
+			ORDER BY posting_date DESC
+			""",
+			"posting_date_name_index",
+		)
+
+	def test_bulk_renewal_of_active_document(self):
+		"""The previous document releases its active_key before the new Active row takes it."""
+		previous = make_document_application(status="Active")
+		with patch.object(frappe.db, "commit"):
+			result = run_bulk_renewal([previous.name], "Renewal", status="Active")
+		self.assertFalse(result["errors"], result["errors"])
+		self.assertEqual(len(result["inserted"]), 1)
+		renewal = frappe.get_doc("Document Application", result["inserted"][0]["name"])
+		self.assertEqual(renewal.status, "Active")
+		self.assertEqual(renewal.previous_document, previous.name)
+		self.assertTrue(renewal.active_key)
+		self.assertEqual(
+			frappe.db.get_value("Document Application", previous.name, ["status", "active_key", "is_head"]),
+			("Renewed", None, 0),
+		)
+
+	def test_attachment_dedupe_keeps_row_url_resolvable(self):
+		content = frappe.generate_hash(length=32).encode()
+		canonical = frappe.get_doc(
+			{"doctype": "File", "file_name": "_test_canonical.txt", "content": content, "is_private": 0}
+		).insert()
+		# a second copy of the same content that File's own dedupe did not catch
+		duplicate = frappe.get_doc(
+			{"doctype": "File", "file_name": "_test_duplicate.txt", "content": b"_" + content, "is_private": 0}
+		).insert()
+		duplicate_path = duplicate.get_full_path()
+		with open(duplicate_path, "wb") as f:
+			f.write(content)
+		frappe.db.set_value("File", duplicate.name, "content_hash", None)
+		application = make_document_application(
+			submit=False,
+			supporting_document=[
+				{"document_type": make_document_type(), "issue_date": nowdate(), "attachment": duplicate.file_url}
+			],
+		)
+		frappe.db.set_value(
+			"File",
+			duplicate.name,
+			{"attached_to_doctype": "Document Application", "attached_to_name": application.name},
+		)
+
+		with patch.object(frappe.db, "commit"):
+			process_pending_attachments(application.name)
+		# what the after-commit callback does
+		remove_unreferenced_file(duplicate.file_url, duplicate_path)
+
+		row = frappe.get_doc("Document Application", application.name).supporting_document[0]
+		self.assertEqual(row.attachment_status, "Processed")
+		self.assertEqual(row.attachment, canonical.file_url)
+		file = frappe.get_doc("File", {"file_url": row.attachment})
+		self.assertTrue(os.path.exists(file.get_full_path()))
+		self.assertFalse(os.path.exists(duplicate_path))
+		self.assertNotEqual(
+			frappe.db.get_value("Document Application", application.name, "modified"), application.modified
+		)
+
+	def get_import_row(self, applicant, **kwargs):
+		return {
+			"applicant_type": "External",
+			"applicant": applicant,
+			"document_type": make_document_type(),
+			"transaction_type": "New Application",
+			"posting_date": nowdate(),
+			"issue_date": nowdate(),
+			"status": "Issued",
+			**kwargs,
+		}
+
+	def test_import_valid_rows(self):
+		rows = [self.get_import_row(make_applicant(f"_Test Import Applicant {i}").name) for i in range(3)]
+		with (
+			patch("quantbit_pro_work_management.bulk_import.IMPORT_CHUNK_SIZE", 2),
+			patch.object(frappe.db, "commit") as commit,
+		):
+			result = import_document_applications(data=rows, run_in_background=0)
+		# one commit per chunk of two rows
+		self.assertEqual(commit.call_count, 2)
+		self.assertEqual(result["total"], 3)
+		self.assertFalse(result["errors"], result["errors"])
+		self.assertEqual([row["row"] for row in result["inserted"]], [1, 2, 3])
+		for row, inserted in zip(rows, result["inserted"], strict=True):
+			doc = frappe.get_doc("Document Application", inserted["name"])
+			self.assertEqual(doc.applicant, row["applicant"])
+			self.assertEqual(doc.document_category, TEST_CATEGORY)
+			self.assertEqual(doc.applicant_full_name, frappe.db.get_value("Applicant", row["applicant"], "full_name"))
+
+	def test_import_reports_bad_link_and_inserts_other_rows(self):
+		applicant = make_applicant("_Test Import Applicant").name
+		rows = [
+			self.get_import_row(applicant),
+			self.get_import_row(applicant, country="_Test Missing Country"),
+			self.get_import_row(make_applicant("_Test Import Applicant 2").name),
+		]
+		with patch.object(frappe.db, "commit"):
+			result = import_document_applications(data=rows, run_in_background=0)
+		self.assertEqual([row["row"] for row in result["inserted"]], [1, 3])
+		self.assertEqual(len(result["errors"]), 1)
+		self.assertEqual(result["errors"][0]["row"], 2)
+		self.assertIn("_Test Missing Country", result["errors"][0]["error"])
+		self.assertFalse(frappe.db.exists("Document Application", {"country": "_Test Missing Country"}))
+
+	def test_import_fetches_previous_referred_expiry_date(self):
+		previous = make_document_application()
+		row = self.get_import_row(
+			previous.applicant,
+			transaction_type="Extension",
+			previous_referred_document=previous.name,
+			extended_date=add_days(previous.expiry_date, 90),
+		)
+		with patch.object(frappe.db, "commit"):
+			result = import_document_applications(data=[row], run_in_background=0)
+		self.assertFalse(result["errors"], result["errors"])
+		extension = frappe.get_doc("Document Application", result["inserted"][0]["name"])
+		self.assertEqual(str(extension.previous_referred_expiry_date), str(previous.expiry_date))
+
+	def test_import_rejects_file_of_another_user(self):
+		file = frappe.get_doc(
+			{
+				"doctype": "File",
+				"file_name": "_test_import.csv",
+				"content": b"applicant_type,document_type\nExternal,_Test Document Type\n",
+				"is_private": 0,
+			}
+		).insert()
+		frappe.db.set_value("File", file.name, "owner", "_test_import_owner@example.com")
+		with self.assertRaises(frappe.PermissionError):
+			import_document_applications(file_url=file.file_url, run_in_background=0)
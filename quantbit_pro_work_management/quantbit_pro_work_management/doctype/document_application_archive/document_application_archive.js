@@ -0,0 +1,31 @@
+// Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Document Application Archive", {
+    refresh(frm) {
+        frm.disable_save();
+        const data = JSON.parse(frm.doc.data || "{}");
+        const rows = (data.supporting_document || []).map((row) => `
+            <tr>
+                <td>${frappe.utils.escape_html(row.document_type || "")}</td>
+                <td>${frappe.datetime.str_to_user(row.issue_date) || ""}</td>
+                <td>${frappe.datetime.str_to_user(row.expiry_date) || ""}</td>
+                <td>${row.verified ? __("Yes") : __("No")}</td>
+                <td>${row.attachment ? `<a href="${encodeURI(row.attachment)}" target="_blank">${__("Open")}</a>` : ""}</td>
+            </tr>
+        `).join("");
+        frm.get_field("details_html").$wrapper.html(`
+            <h5>${__("Supporting Documents")}</h5>
+            <table class="table table-bordered table-sm">
+                <thead><tr>
+                    <th>${__("Document Type")}</th>
+                    <th>${__("Issue Date")}</th>
+                    <th>${__("Expiry Date")}</th>
+                    <th>${__("Verified")}</th>
+                    <th>${__("Attachment")}</th>
+                </tr></thead>
+                <tbody>${rows || `<tr><td colspan="5" class="text-muted">${__("None")}</td></tr>`}</tbody>
+            </table>
+        `);
+    }
+});
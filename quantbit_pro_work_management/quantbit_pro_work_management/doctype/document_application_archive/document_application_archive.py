@@ -0,0 +1,23 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+ARCHIVE_INDEXES = {
+    # archived documents of an applicant
+    "applicant_index": ["applicant"],
+    # Document Application Report with "Include Archived"
+    "posting_date_name_index": ["posting_date", "name"],
+    # get_document_chain
+    "root_document_chain_depth_index": ["root_document", "chain_depth"],
+}
+
+
+class DocumentApplicationArchive(Document):
+    pass
+
+
+def on_doctype_update():
+    for index_name, fields in ARCHIVE_INDEXES.items():
+        frappe.db.add_index("Document Application Archive", fields, index_name)
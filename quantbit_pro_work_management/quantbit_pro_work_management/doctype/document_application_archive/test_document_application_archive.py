@@ -0,0 +1,66 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from quantbit_pro_work_management.archive import archive_closed_applications
+from quantbit_pro_work_management.bulk_renewal import run_bulk_renewal
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+	get_document_chain,
+	set_status_in_bulk,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.test_document_application import (
+	make_document_application,
+	make_document_type,
+)
+
+
+class TestDocumentApplicationArchive(FrappeTestCase):
+	def make_closed_chain(self, posting_date):
+		"""A renewed application and its expired renewal, both posted on `posting_date`."""
+		original = make_document_application(
+			supporting_document=[
+				{"document_type": make_document_type(), "issue_date": nowdate(), "attachment": "/files/_test_archive.txt"}
+			],
+		)
+		with patch.object(frappe.db, "commit"):
+			renewal = run_bulk_renewal([original.name], "Renewal")["inserted"][0]["name"]
+		set_status_in_bulk([renewal], "Expired")
+		frappe.db.set_value(
+			"Document Application", {"name": ["in", [original.name, renewal]]}, "posting_date", posting_date
+		)
+		return [original.name, renewal]
+
+	def test_closed_chain_is_archived_whole(self):
+		chain = self.make_closed_chain(add_days(nowdate(), -1000))
+		with patch.object(frappe.db, "commit"):
+			archive_closed_applications()
+
+		for name in chain:
+			self.assertFalse(frappe.db.exists("Document Application", name))
+			self.assertTrue(frappe.db.exists("Document Application Archive", name))
+		self.assertFalse(frappe.db.exists("Supporting Document", {"parent": chain[0]}))
+		self.assertEqual(
+			frappe.db.get_value(
+				"Archived Supporting Document",
+				{"parent": chain[0], "parenttype": "Document Application Archive"},
+				"attachment",
+			),
+			"/files/_test_archive.txt",
+		)
+		self.assertEqual(
+			[(row.name, row.archived) for row in get_document_chain(chain[1])],
+			[(chain[0], 1), (chain[1], 1)],
+		)
+
+	def test_recent_chain_is_kept(self):
+		chain = self.make_closed_chain(nowdate())
+		with patch.object(frappe.db, "commit"):
+			archive_closed_applications()
+		for name in chain:
+			self.assertTrue(frappe.db.exists("Document Application", name))
+			self.assertFalse(frappe.db.exists("Document Application Archive", name))
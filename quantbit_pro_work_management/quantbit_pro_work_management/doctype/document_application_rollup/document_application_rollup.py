@@ -0,0 +1,127 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import get_first_day, now_datetime
+
+ROLLUP_FIELDS = ("posting_date", "document_category", "document_type", "transaction_type", "status")
+
+
+class DocumentApplicationRollup(Document):
+    pass
+
+
+def on_document_application_change(doc, method=None):
+    """doc_events handler: move the application from its old bucket to its new one."""
+    previous = doc.get_doc_before_save()
+    old_key = get_rollup_key(previous) if previous else None
+    new_key = get_rollup_key(doc)
+    if old_key != new_key:
+        apply_rollup_deltas([(old_key, -1), (new_key, 1)])
+
+
+def on_document_application_trash(doc, method=None):
+    apply_rollup_deltas([(get_rollup_key(doc), -1)])
+
+
+def get_rollup_key(doc):
+    if not doc.get("posting_date"):
+        return None
+    return (
+        get_first_day(doc.get("posting_date")),
+        doc.get("document_category") or "",
+        doc.get("document_type") or "",
+        doc.get("transaction_type") or "",
+        doc.get("status") or "",
+    )
+
+
+def get_rollup_name(key):
+    return hashlib.sha1("|".join(str(part) for part in key).encode()).hexdigest()[:20]
+
+
+def apply_rollup_deltas(deltas):
+    """Add (key, delta) pairs to the rollup with a single upsert."""
+    totals = {}
+    for key, delta in deltas:
+        if key:
+            totals[key] = totals.get(key, 0) + delta
+    totals = {key: delta for key, delta in totals.items() if delta}
+    if not totals:
+        return
+    timestamp = now_datetime()
+    user = frappe.session.user
+    placeholders = []
+    values = []
+    # concurrent expiry chunks upsert the same rows, so lock them in one global order
+    for key, delta in sorted(totals.items()):
+        placeholders.append("(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
+        values.extend([get_rollup_name(key), timestamp, timestamp, user, user, *key, delta])
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabDocument Application Rollup`
+            (name, creation, modified, owner, modified_by,
+            month, document_category, document_type, transaction_type, status, application_count)
+        VALUES {", ".join(placeholders)}
+        ON DUPLICATE KEY UPDATE
+            application_count = application_count + VALUES(application_count),
+            modified = VALUES(modified)
+        """,
+        values,
+    )
+
+
+@frappe.whitelist()
+def rebuild_rollup():
+    """Recompute every bucket from the live and archived applications to repair drift."""
+    frappe.only_for("System Manager")
+    rows = frappe.db.sql(
+        """
+        SELECT
+            DATE_FORMAT(posting_date, '%Y-%m-01') AS month,
+            IFNULL(document_category, '') AS document_category,
+            IFNULL(document_type, '') AS document_type,
+            IFNULL(transaction_type, '') AS transaction_type,
+            IFNULL(status, '') AS status,
+            COUNT(*) AS application_count
+        FROM (
+            SELECT posting_date, document_category, document_type, transaction_type, status
+            FROM `tabDocument Application`
+            UNION ALL
+            SELECT posting_date, document_category, document_type, transaction_type, status
+            FROM `tabDocument Application Archive`
+        ) applications
+        WHERE posting_date IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+        """,
+        as_dict=True,
+    )
+    frappe.db.delete("Document Application Rollup")
+    timestamp = now_datetime()
+    user = frappe.session.user
+    values = []
+    for row in rows:
+        key = (
+            get_first_day(row.month),
+            row.document_category,
+            row.document_type,
+            row.transaction_type,
+            row.status,
+        )
+        values.append(
+            (get_rollup_name(key), timestamp, timestamp, user, user, *key, row.application_count)
+        )
+    frappe.db.bulk_insert(
+        "Document Application Rollup",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            "month", "document_category", "document_type", "transaction_type", "status",
+            "application_count",
+        ],
+        values,
+    )
+    frappe.db.commit()
+    return len(values)
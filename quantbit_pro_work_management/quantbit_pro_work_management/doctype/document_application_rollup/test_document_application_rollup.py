@@ -0,0 +1,40 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+	set_status_in_bulk,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.test_document_application import (
+	make_document_application,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application_rollup.document_application_rollup import (
+	get_rollup_key,
+	get_rollup_name,
+)
+
+
+def get_count(doc, status):
+	key = get_rollup_key(frappe._dict(doc.as_dict(), status=status))
+	return frappe.db.get_value("Document Application Rollup", get_rollup_name(key), "application_count") or 0
+
+
+class TestDocumentApplicationRollup(FrappeTestCase):
+	def test_save_and_bulk_status_change_move_the_count(self):
+		doc = make_document_application(submit=False)
+		issued, expired = get_count(doc, "Issued"), get_count(doc, "Expired")
+		doc.submit()
+		# submitting keeps the status, so the application stays in its bucket
+		self.assertEqual(get_count(doc, "Issued"), issued)
+
+		set_status_in_bulk([doc.name], "Expired")
+		self.assertEqual(get_count(doc, "Issued"), issued - 1)
+		self.assertEqual(get_count(doc, "Expired"), expired + 1)
+
+	def test_delete_removes_the_count(self):
+		doc = make_document_application(submit=False)
+		issued = get_count(doc, "Issued")
+		doc.delete()
+		self.assertEqual(get_count(doc, "Issued"), issued - 1)
@@ -4,6 +4,18 @@
 # import frappe
 from frappe.model.document import Document
 
+from quantbit_pro_work_management.master_data import clear_master_data_cache
+
 
 class DocumentCategory(Document):
-	pass
+	def on_update(self):
+		clear_master_data_cache(self.doctype, self.name)
+
+	def on_trash(self):
+		clear_master_data_cache(self.doctype, self.name)
+
+	def after_rename(self, old, new, merge=False):
+		clear_master_data_cache(self.doctype, old)
+		clear_master_data_cache(self.doctype, new)
+		# Document Type rows cache the category name, so they are stale too
+		clear_master_data_cache("Document Type")
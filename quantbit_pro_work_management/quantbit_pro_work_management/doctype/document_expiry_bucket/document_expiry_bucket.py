@@ -0,0 +1,145 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, getdate, now_datetime, nowdate
+
+LIVE_STATUSES = ("Active", "Issued")
+MAX_FORECAST_DAYS = 366
+
+
+class DocumentExpiryBucket(Document):
+    pass
+
+
+def on_document_application_change(doc, method=None):
+    """doc_events handler: move the application to the bucket of its new effective expiry."""
+    previous = doc.get_doc_before_save()
+    old_key = get_bucket_key(previous) if previous else None
+    new_key = get_bucket_key(doc)
+    if old_key != new_key:
+        apply_bucket_deltas([(old_key, -1), (new_key, 1)])
+
+
+def on_document_application_trash(doc, method=None):
+    apply_bucket_deltas([(get_bucket_key(doc), -1)])
+
+
+def get_bucket_key(doc):
+    """Submitted, still live applications count on their effective expiry date."""
+    if (
+        doc.get("docstatus") != 1
+        or doc.get("status") not in LIVE_STATUSES
+        or not doc.get("effective_expiry_date")
+    ):
+        return None
+    return (getdate(doc.get("effective_expiry_date")), doc.get("document_type") or "")
+
+
+def get_bucket_name(key):
+    return hashlib.sha1("|".join(str(part) for part in key).encode()).hexdigest()[:20]
+
+
+def apply_bucket_deltas(deltas):
+    """Add (key, delta) pairs to the buckets with a single upsert."""
+    totals = {}
+    for key, delta in deltas:
+        if key:
+            totals[key] = totals.get(key, 0) + delta
+    totals = {key: delta for key, delta in totals.items() if delta}
+    if not totals:
+        return
+    timestamp = now_datetime()
+    user = frappe.session.user
+    placeholders = []
+    values = []
+    # concurrent expiry chunks upsert the same rows, so lock them in one global order
+    for key, delta in sorted(totals.items()):
+        placeholders.append("(%s, %s, %s, %s, %s, %s, %s, %s)")
+        values.extend([get_bucket_name(key), timestamp, timestamp, user, user, *key, delta])
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabDocument Expiry Bucket`
+            (name, creation, modified, owner, modified_by, expiry_date, document_type, application_count)
+        VALUES {", ".join(placeholders)}
+        ON DUPLICATE KEY UPDATE
+            application_count = application_count + VALUES(application_count),
+            modified = VALUES(modified)
+        """,
+        values,
+    )
+
+
+@frappe.whitelist()
+def get_expiry_forecast(from_date=None, days=90, group_by="Day", document_type=None):
+    """Live applications expiring per day or week over the next `days`, by document type.
+
+    Returns {"from_date", "to_date", "periods": [{"period", "document_type", "count"}]}
+    with weeks starting on Monday.
+    """
+    frappe.has_permission("Document Application", "read", throw=True)
+    from_date = getdate(from_date or nowdate())
+    days = min(max(cint(days), 1), MAX_FORECAST_DAYS)
+    to_date = add_days(from_date, days - 1)
+    if group_by == "Week":
+        period = "DATE_SUB(expiry_date, INTERVAL WEEKDAY(expiry_date) DAY)"
+    else:
+        period = "expiry_date"
+    values = {"from_date": from_date, "to_date": to_date}
+    condition = ""
+    if document_type:
+        condition = "AND document_type = %(document_type)s"
+        values["document_type"] = document_type
+    periods = frappe.db.sql(
+        f"""
+        SELECT {period} AS period, document_type, SUM(application_count) AS count
+        FROM `tabDocument Expiry Bucket`
+        WHERE expiry_date BETWEEN %(from_date)s AND %(to_date)s
+            AND application_count > 0
+            {condition}
+        GROUP BY period, document_type
+        ORDER BY period, document_type
+        """,
+        values,
+        as_dict=True,
+    )
+    return {"from_date": from_date, "to_date": to_date, "periods": periods}
+
+
+@frappe.whitelist()
+def rebuild_expiry_buckets():
+    """Recompute every bucket from `tabDocument Application` to repair drift."""
+    frappe.only_for("System Manager")
+    rows = frappe.db.sql(
+        """
+        SELECT effective_expiry_date, IFNULL(document_type, '') AS document_type, COUNT(*) AS count
+        FROM `tabDocument Application`
+        WHERE docstatus = 1
+            AND status IN %(statuses)s
+            AND effective_expiry_date IS NOT NULL
+        GROUP BY 1, 2
+        """,
+        {"statuses": LIVE_STATUSES},
+    )
+    frappe.db.delete("Document Expiry Bucket")
+    timestamp = now_datetime()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Document Expiry Bucket",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            "expiry_date", "document_type", "application_count",
+        ],
+        [
+            (
+                get_bucket_name((expiry_date, document_type)), timestamp, timestamp, user, user,
+                expiry_date, document_type, count,
+            )
+            for expiry_date, document_type, count in rows
+        ],
+    )
+    frappe.db.commit()
+    return len(rows)
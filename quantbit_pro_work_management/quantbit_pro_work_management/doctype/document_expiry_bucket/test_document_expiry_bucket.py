@@ -0,0 +1,32 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+	set_status_in_bulk,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.test_document_application import (
+	make_document_application,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket import (
+	get_bucket_name,
+)
+
+
+def get_count(doc):
+	key = (getdate(doc.effective_expiry_date), doc.document_type)
+	return frappe.db.get_value("Document Expiry Bucket", get_bucket_name(key), "application_count") or 0
+
+
+class TestDocumentExpiryBucket(FrappeTestCase):
+	def test_only_submitted_live_applications_are_counted(self):
+		doc = make_document_application(submit=False)
+		count = get_count(doc)
+		doc.submit()
+		self.assertEqual(get_count(doc), count + 1)
+
+		set_status_in_bulk([doc.name], "Expired")
+		self.assertEqual(get_count(doc), count)
@@ -0,0 +1,87 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, nowdate
+
+from quantbit_pro_work_management.bulk_renewal import run_bulk_renewal
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.test_document_application import (
+	make_document_application,
+	make_document_type,
+)
+from quantbit_pro_work_management.tasks import process_due_documents
+
+
+class TestDocumentReminderLedger(FrappeTestCase):
+	def setUp(self):
+		self.today = getdate(nowdate())
+		# expires in 10 days, inside the 30 day reminder window of the test Document Type
+		self.application = make_document_application(issue_date=add_days(self.today, -354))
+
+	def get_reminded(self):
+		"""Names of the applications the daily job reminds today."""
+		with patch("quantbit_pro_work_management.tasks.queue_expiry_notifications") as queue:
+			process_due_documents(self.today, commit=False)
+		due_documents = queue.call_args.args[0]
+		return {doc.name for doc in due_documents if doc.reference_doctype == "Document Application"}
+
+	def make_due_again(self):
+		"""As after a re-run of the day or a reminder window change: the entry is due today again."""
+		frappe.db.set_value(
+			"Expiry Index",
+			{"reference_doctype": "Document Application", "reference_name": self.application.name},
+			{"next_reminder_date": self.today, "due_date": self.today},
+		)
+
+	def test_reminded_once_per_threshold(self):
+		self.assertIn(self.application.name, self.get_reminded())
+		self.assertTrue(frappe.db.exists("Document Reminder Ledger", f"{self.application.name}::30"))
+
+		self.make_due_again()
+		self.assertNotIn(self.application.name, self.get_reminded())
+		self.assertEqual(
+			frappe.db.count("Document Reminder Ledger", {"document_application": self.application.name}), 1
+		)
+
+	def test_ledger_cleared_on_renewal(self):
+		self.get_reminded()
+		with patch.object(frappe.db, "commit"):
+			result = run_bulk_renewal([self.application.name], "Renewal")
+		self.assertFalse(result["errors"], result["errors"])
+		self.assertFalse(
+			frappe.db.exists("Document Reminder Ledger", {"document_application": self.application.name})
+		)
+
+	def test_threshold_change_resumes_after_sent_reminders(self):
+		document_type = make_document_type("_Test Reminder Document Type")
+		sent = make_document_application(document_type=document_type, issue_date=add_days(self.today, -354))
+		unsent = make_document_application(document_type=document_type, issue_date=add_days(self.today, -300))
+		with patch("quantbit_pro_work_management.tasks.queue_expiry_notifications"):
+			process_due_documents(self.today, commit=False)
+		self.assertTrue(frappe.db.exists("Document Reminder Ledger", f"{sent.name}::30"))
+
+		doc = frappe.get_doc("Document Type", document_type)
+		doc.append("additional_reminders", {"days_before_expiry": 60})
+		doc.append("additional_reminders", {"days_before_expiry": 7})
+		doc.save()
+
+		# 30 days was already sent, so the next reminder is at 7 days, not back at 60
+		expiry_date = frappe.db.get_value("Document Application", sent.name, "effective_expiry_date")
+		self.assertEqual(
+			frappe.db.get_value("Document Application", sent.name, "next_reminder_date"), add_days(expiry_date, -7)
+		)
+		self.assertEqual(
+			frappe.db.get_value(
+				"Expiry Index",
+				{"reference_doctype": "Document Application", "reference_name": sent.name},
+				["next_reminder_date", "due_date"],
+			),
+			(add_days(expiry_date, -7), add_days(expiry_date, -7)),
+		)
+		expiry_date = frappe.db.get_value("Document Application", unsent.name, "effective_expiry_date")
+		self.assertEqual(
+			frappe.db.get_value("Document Application", unsent.name, "next_reminder_date"), add_days(expiry_date, -60)
+		)
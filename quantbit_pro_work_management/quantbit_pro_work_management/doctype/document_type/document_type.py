@@ -4,6 +4,29 @@
 # import frappe
 from frappe.model.document import Document
 
+from quantbit_pro_work_management.master_data import clear_master_data_cache, get_reminder_thresholds
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+	update_next_reminder_dates,
+)
+
 
 class DocumentType(Document):
-	pass
+	def on_update(self):
+		clear_master_data_cache(self.doctype, self.name)
+		thresholds = self.get_reminder_thresholds()
+		previous = self.get_doc_before_save()
+		if not previous or previous.get_reminder_thresholds() != thresholds:
+			update_next_reminder_dates(self.name, thresholds)
+
+	def get_reminder_thresholds(self):
+		return get_reminder_thresholds(
+			self.reminder_days_before_expiry,
+			[row.days_before_expiry for row in self.additional_reminders],
+		)
+
+	def on_trash(self):
+		clear_master_data_cache(self.doctype, self.name)
+
+	def after_rename(self, old, new, merge=False):
+		clear_master_data_cache(self.doctype, old)
+		clear_master_data_cache(self.doctype, new)
@@ -0,0 +1,257 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, getdate, now_datetime
+
+from quantbit_pro_work_management.master_data import get_document_type
+
+LIVE_STATUSES = ("Active", "Issued")
+REBUILD_BATCH_SIZE = 1000
+ENTRY_FIELDS = [
+    "reference_doctype",
+    "reference_name",
+    "parent_document",
+    "applicant",
+    "document_type",
+    "expiry_date",
+    "next_reminder_date",
+    "due_date",
+]
+
+
+class ExpiryIndex(Document):
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_index("Expiry Index", ["due_date", "owner"], "due_date_owner_index")
+    frappe.db.add_index(
+        "Expiry Index", ["reference_doctype", "reference_name"], "reference_doctype_reference_name_index"
+    )
+
+
+def on_document_application_change(doc, method=None):
+    """doc_events handler: re-index the application and its supporting documents when they changed."""
+    previous = doc.get_doc_before_save()
+    entries = get_document_application_entries(doc)
+    if entries == (get_document_application_entries(previous) if previous else []):
+        return
+    delete_document_application_entries([doc.name])
+    insert_entries(entries)
+
+
+def on_document_application_trash(doc, method=None):
+    delete_document_application_entries([doc.name])
+
+
+def on_applicant_change(doc, method=None):
+    previous = doc.get_doc_before_save()
+    entries = get_applicant_entries(doc)
+    if entries == (get_applicant_entries(previous) if previous else []):
+        return
+    frappe.db.delete("Expiry Index", {"reference_doctype": "Applicant", "reference_name": doc.name})
+    insert_entries(entries)
+
+
+def on_applicant_trash(doc, method=None):
+    frappe.db.delete("Expiry Index", {"reference_doctype": "Applicant", "reference_name": doc.name})
+
+
+def get_document_application_entries(doc):
+    """Submitted, live applications index their effective expiry and the expiry of each supporting document."""
+    if doc.get("docstatus") != 1 or doc.get("status") not in LIVE_STATUSES:
+        return []
+    entries = []
+    if doc.get("effective_expiry_date"):
+        entries.append(make_entry(
+            "Document Application", doc.name, doc.owner, doc.applicant, doc.document_type,
+            doc.effective_expiry_date, doc.next_reminder_date,
+        ))
+    for row in doc.get("supporting_document") or []:
+        if row.get("expiry_date"):
+            entries.append(make_entry(
+                "Supporting Document", row.name, doc.owner, doc.applicant, row.document_type,
+                row.expiry_date, get_first_reminder_date("Supporting Document", row.document_type, row.expiry_date),
+                parent_document=doc.name,
+            ))
+    return entries
+
+
+def get_applicant_entries(doc):
+    """Active applicants index their passport expiry."""
+    if doc.get("status") != "Active" or not doc.get("passport_expiry"):
+        return []
+    return [make_entry(
+        "Applicant", doc.name, doc.owner, doc.name, None,
+        doc.passport_expiry, get_first_reminder_date("Applicant", None, doc.passport_expiry),
+    )]
+
+
+def make_entry(reference_doctype, reference_name, owner, applicant, document_type, expiry_date,
+               next_reminder_date, parent_document=None):
+    expiry_date = getdate(expiry_date)
+    next_reminder_date = getdate(next_reminder_date) if next_reminder_date else None
+    return frappe._dict(
+        name=get_entry_name(reference_doctype, reference_name),
+        owner=owner,
+        reference_doctype=reference_doctype,
+        reference_name=reference_name,
+        parent_document=parent_document,
+        applicant=applicant,
+        document_type=document_type,
+        expiry_date=expiry_date,
+        next_reminder_date=next_reminder_date,
+        due_date=get_due_date(expiry_date, next_reminder_date),
+    )
+
+
+def get_entry_name(reference_doctype, reference_name):
+    return f"{reference_doctype}::{reference_name}"
+
+
+def get_due_date(expiry_date, next_reminder_date):
+    """The earlier of the next reminder and the first day after expiry."""
+    expired_on = add_days(expiry_date, 1)
+    return min(getdate(next_reminder_date), expired_on) if next_reminder_date else expired_on
+
+
+def get_reminder_thresholds(reference_doctype, document_type):
+    """Reminder days before expiry, largest first."""
+    if reference_doctype == "Applicant":
+        return [get_passport_reminder_days()]
+    doc_type = get_document_type(document_type) if document_type else None
+    return doc_type.reminder_thresholds if doc_type else []
+
+
+def get_passport_reminder_days(settings=None):
+    # read for every passport row of the daily job, so from the cached settings document
+    settings = settings or frappe.get_cached_doc("Pro Work Settings")
+    return cint(settings.passport_reminder_days) or 90
+
+
+def get_first_reminder_date(reference_doctype, document_type, expiry_date):
+    thresholds = get_reminder_thresholds(reference_doctype, document_type)
+    return add_days(expiry_date, -thresholds[0]) if thresholds else None
+
+
+def update_entry_reminder_dates(reminder_days, document_type=None, reference_doctype=None):
+    """Re-derive the next reminder and due dates after a reminder window changes.
+
+    Entries already closed as expired (no due date) are left alone.
+    """
+    conditions = ["due_date IS NOT NULL"]
+    if document_type:
+        conditions.append("document_type = %(document_type)s")
+    if reference_doctype:
+        conditions.append("reference_doctype = %(reference_doctype)s")
+    frappe.db.sql(
+        f"""
+        UPDATE `tabExpiry Index`
+        SET next_reminder_date = IF(%(days)s > 0, DATE_SUB(expiry_date, INTERVAL %(days)s DAY), NULL),
+            due_date = IF(%(days)s > 0,
+                DATE_SUB(expiry_date, INTERVAL %(days)s DAY),
+                DATE_ADD(expiry_date, INTERVAL 1 DAY))
+        WHERE {" AND ".join(conditions)}
+        """,
+        {"days": cint(reminder_days), "document_type": document_type, "reference_doctype": reference_doctype},
+    )
+
+
+def insert_entries(entries):
+    """Write index entries with one bulk insert; `owner` is the owner of the indexed document."""
+    if not entries:
+        return
+    timestamp = now_datetime()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Expiry Index",
+        ["name", "creation", "modified", "owner", "modified_by", *ENTRY_FIELDS],
+        [
+            (entry.name, timestamp, timestamp, entry.owner, user, *(entry[field] for field in ENTRY_FIELDS))
+            for entry in entries
+        ],
+        ignore_duplicates=True,
+    )
+
+
+def delete_document_application_entries(names):
+    if not names:
+        return
+    frappe.db.delete(
+        "Expiry Index", {"reference_doctype": "Document Application", "reference_name": ["in", names]}
+    )
+    frappe.db.delete("Expiry Index", {"parent_document": ["in", names]})
+
+
+def refresh_document_application_entries(names):
+    """Re-index applications changed without a save, e.g. by set_status_in_bulk."""
+    if not names:
+        return
+    documents = frappe.get_all(
+        "Document Application",
+        filters={"name": ["in", names], "docstatus": 1, "status": ["in", LIVE_STATUSES]},
+        fields=[
+            "name", "docstatus", "status", "owner", "applicant", "document_type",
+            "effective_expiry_date", "next_reminder_date",
+        ],
+    )
+    supporting_documents = {}
+    if documents:
+        for row in frappe.get_all(
+            "Supporting Document",
+            filters={
+                "parenttype": "Document Application",
+                "parent": ["in", [doc.name for doc in documents]],
+                "expiry_date": ["is", "set"],
+            },
+            fields=["name", "parent", "document_type", "expiry_date"],
+        ):
+            supporting_documents.setdefault(row.parent, []).append(row)
+    entries = []
+    for doc in documents:
+        doc.supporting_document = supporting_documents.get(doc.name, [])
+        entries.extend(get_document_application_entries(doc))
+    delete_document_application_entries(names)
+    insert_entries(entries)
+
+
+def refresh_applicant_entries(names):
+    if not names:
+        return
+    applicants = frappe.get_all(
+        "Applicant",
+        filters={"name": ["in", names]},
+        fields=["name", "owner", "status", "passport_expiry"],
+    )
+    frappe.db.delete("Expiry Index", {"reference_doctype": "Applicant", "reference_name": ["in", names]})
+    insert_entries([entry for applicant in applicants for entry in get_applicant_entries(applicant)])
+
+
+@frappe.whitelist()
+def rebuild_expiry_index():
+    """Re-index every live application and active applicant in batches, e.g. after install."""
+    frappe.only_for("System Manager")
+    frappe.db.delete("Expiry Index")
+    for doctype, filters, refresh in (
+        (
+            "Document Application",
+            {"docstatus": 1, "status": ["in", LIVE_STATUSES]},
+            refresh_document_application_entries,
+        ),
+        ("Applicant", {"status": "Active", "passport_expiry": ["is", "set"]}, refresh_applicant_entries),
+    ):
+        last_name = ""
+        while True:
+            names = frappe.get_all(
+                doctype,
+                filters={**filters, "name": [">", last_name]},
+                pluck="name",
+                order_by="name",
+                limit=REBUILD_BATCH_SIZE,
+            )
+            if not names:
+                break
+            refresh(names)
+            last_name = names[-1]
@@ -0,0 +1,131 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, now_datetime
+
+from quantbit_pro_work_management.tasks import (
+	create_expiry_job_run,
+	enqueue_expiry_chunks,
+	process_expiry_chunk,
+)
+
+PLAN_ROWS = 2000
+
+
+class TestExpiryIndex(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		"""Seed enough rows that a full scan is never the cheapest plan; rolled back after the class."""
+		super().setUpClass()
+		timestamp = now_datetime()
+		frappe.db.bulk_insert(
+			"Expiry Index",
+			[
+				"name",
+				"creation",
+				"modified",
+				"owner",
+				"modified_by",
+				"reference_doctype",
+				"reference_name",
+				"expiry_date",
+				"due_date",
+			],
+			[
+				(
+					f"_Test Plan::{i:05d}",
+					timestamp,
+					timestamp,
+					f"_test_plan_{i % 20}@example.com",
+					"Administrator",
+					"Document Application",
+					f"_Test Plan {i:05d}",
+					add_days("2020-01-31", i),
+					add_days("2020-01-01", i),
+				)
+				for i in range(PLAN_ROWS)
+			],
+		)
+
+	def test_due_scan_plan(self):
+		"""The daily job's chunk scan: due_date range within an (owner, name) range."""
+		query = """
+			SELECT name FROM `tabExpiry Index`
+			WHERE due_date <= '2020-01-20'
+				AND (owner, name) >= ('_test_plan_1@example.com', '')
+				AND (owner, name) < ('_test_plan_2@example.com', '')
+		"""
+		plan = frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+		self.assertTrue(plan)
+		for row in plan:
+			self.assertNotEqual(row.type, "ALL", f"Full scan: {row}")
+			self.assertEqual(row.key, "due_date_owner_index", f"Unexpected index: {row}")
+
+	def plan_run(self, today, chunk_size):
+		with (
+			patch("quantbit_pro_work_management.tasks.EXPIRY_CHUNK_SIZE", chunk_size),
+			patch.object(frappe.db, "commit"),
+		):
+			return frappe.get_doc("Expiry Job Run", create_expiry_job_run(getdate(today)))
+
+	def test_job_run_chunk_boundaries(self):
+		due = [
+			(row.owner, row.name)
+			for row in frappe.get_all(
+				"Expiry Index", filters={"due_date": ["<=", "2020-01-20"]}, fields=["owner", "name"]
+			)
+		]
+		due.sort()
+		job_run = self.plan_run("2020-01-20", 7)
+
+		self.assertEqual(job_run.total_documents, len(due))
+		self.assertEqual(len(job_run.chunks), -(-len(due) // 7))
+		self.assertEqual((job_run.chunks[0].from_owner, job_run.chunks[0].from_name), ("", ""))
+		self.assertEqual((job_run.chunks[-1].to_owner, job_run.chunks[-1].to_name), ("", ""))
+		for i, chunk in enumerate(job_run.chunks):
+			if i:
+				# each chunk starts where the previous one ends, at every 7th due entry
+				self.assertEqual((chunk.from_owner, chunk.from_name), due[i * 7])
+				previous = job_run.chunks[i - 1]
+				self.assertEqual((previous.to_owner, previous.to_name), (chunk.from_owner, chunk.from_name))
+			self.assertEqual(chunk.document_count, len(due[i * 7 : (i + 1) * 7]))
+
+	def test_resume_failed_job_run(self):
+		job_run = self.plan_run("2020-01-20", 7)
+		failing_chunk = job_run.chunks[1]
+		fail_once = [
+			((failing_chunk.from_owner, failing_chunk.from_name), (failing_chunk.to_owner, failing_chunk.to_name))
+		]
+
+		def process_due_documents(today, key_range=None, **kwargs):
+			if key_range in fail_once:
+				fail_once.remove(key_range)
+				raise Exception("_Test chunk failure")
+			return {"expired": 0, "reminded": 1}
+
+		with (
+			patch("quantbit_pro_work_management.tasks.process_due_documents", process_due_documents),
+			patch.object(frappe.db, "commit"),
+			patch.object(frappe.db, "rollback"),
+			patch("frappe.enqueue") as enqueue,
+		):
+			for chunk in job_run.chunks:
+				process_expiry_chunk(job_run.name, chunk.name)
+			self.assertEqual(frappe.db.get_value("Expiry Job Run", job_run.name, "status"), "Failed")
+			self.assertEqual(
+				frappe.db.get_value("Expiry Job Run Chunk", failing_chunk.name, "status"), "Failed"
+			)
+
+			# only the failed chunk is queued again, and finishing it completes the run
+			enqueue_expiry_chunks(job_run.name)
+			self.assertEqual([call.kwargs["chunk"] for call in enqueue.call_args_list], [failing_chunk.name])
+			process_expiry_chunk(job_run.name, failing_chunk.name)
+
+		job_run.reload()
+		self.assertEqual(job_run.status, "Completed")
+		self.assertEqual(job_run.reminded, len(job_run.chunks))
+		self.assertEqual({chunk.status for chunk in job_run.chunks}, {"Completed"})
@@ -0,0 +1,19 @@
+// Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Expiry Job Run", {
+    refresh: function(frm) {
+        if (frm.doc.status !== "Completed") {
+            frm.add_custom_button(__("Resume"), function() {
+                frappe.call({
+                    method: "quantbit_pro_work_management.tasks.resume_expiry_job_run",
+                    args: { job_run: frm.doc.name },
+                    callback: function() {
+                        frappe.show_alert(__("Pending chunks queued"));
+                        frm.reload_doc();
+                    }
+                });
+            });
+        }
+    }
+});
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class NameSearchToken(Document):
+    pass
+
+
+def on_doctype_update():
+    frappe.db.add_index("Name Search Token", ["reference_doctype", "token"])
+    frappe.db.add_index("Name Search Token", ["reference_doctype", "reference_name"])
@@ -0,0 +1,214 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+from frappe.utils import add_to_date, now_datetime
+
+OUTBOX_BATCH_SIZE = 500
+MAX_ATTEMPTS = 5
+RETRY_BASE_MINUTES = 5
+
+
+class NotificationOutbox(Document):
+    @staticmethod
+    def clear_old_logs(days=30):
+        """Called by Log Settings; only delivered or given-up rows are removed, never Pending ones."""
+        table = frappe.qb.DocType("Notification Outbox")
+        frappe.db.delete(
+            table,
+            filters=(table.status.isin(["Sent", "Failed"])) & (table.creation < (Now() - Interval(days=days))),
+        )
+
+
+def on_doctype_update():
+    frappe.db.add_index(
+        "Notification Outbox", ["status", "next_attempt_at"], "status_next_attempt_at_index"
+    )
+
+
+def queue_notifications(notifications):
+    """Write outbox rows in the caller's transaction with one bulk insert.
+
+    Each notification is a dict with dedup_key, event, recipient, subject,
+    message and optionally channel, reference_doctype and reference_name.
+    A dedup_key that is already queued (or sent) is skipped. The bulk insert
+    skips Select validation, so an event missing from the options is refused
+    here rather than breaking a later save of the row.
+    """
+    if not notifications:
+        return
+    events = frappe.get_meta("Notification Outbox").get_options("event").split("\n")
+    for row in notifications:
+        if row["event"] not in events:
+            frappe.throw(f"Notification Outbox event {row['event']} is not one of its options.")
+    timestamp = now_datetime()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Notification Outbox",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            "dedup_key", "event", "channel", "status", "attempts",
+            "recipient", "reference_doctype", "reference_name", "subject", "message",
+        ],
+        [
+            (
+                row["dedup_key"], timestamp, timestamp, user, user,
+                row["dedup_key"], row["event"], row.get("channel") or "Email and System", "Pending", 0,
+                row["recipient"], row.get("reference_doctype") or "Document Application",
+                row.get("reference_name"), row["subject"], row["message"],
+            )
+            for row in notifications
+        ],
+        ignore_duplicates=True,
+    )
+
+
+def on_document_application_change(doc, method=None):
+    """doc_events handler: tell the owner their application was submitted or issued."""
+    if doc.owner == frappe.session.user:
+        return
+    previous = doc.get_doc_before_save()
+    if doc.status == "Issued" and (not previous or previous.status != "Issued"):
+        valid_until = f", valid until {doc.effective_expiry_date}" if doc.effective_expiry_date else ""
+        notification = {
+            "dedup_key": f"Issued::{doc.name}::{doc.effective_expiry_date}",
+            "event": "Issued",
+            "subject": "Document Issued",
+            "message": f"Document {doc.name} ({doc.document_type}) has been issued{valid_until}.",
+        }
+    elif doc.docstatus == 1 and (not previous or previous.docstatus != 1):
+        notification = {
+            "dedup_key": f"Submitted::{doc.name}",
+            "event": "Submitted",
+            "subject": "Document Application Submitted",
+            "message": f"Document {doc.name} ({doc.document_type}) has been submitted.",
+        }
+    else:
+        return
+    queue_notifications([{**notification, "recipient": doc.owner, "reference_name": doc.name}])
+
+
+def flush_outbox(batch_size=OUTBOX_BATCH_SIZE):
+    """Scheduler: deliver due outbox rows, one committed batch at a time."""
+    while flush_outbox_batch(batch_size) >= batch_size:
+        pass
+
+
+def flush_outbox_batch(batch_size=OUTBOX_BATCH_SIZE):
+    """Turn up to `batch_size` pending rows into Email Queue and Notification Log records.
+
+    Rows are locked with SKIP LOCKED so several flushers can run side by side.
+    A row whose email fails is retried with exponential backoff and marked
+    Failed after MAX_ATTEMPTS.
+    """
+    now = now_datetime()
+    rows = frappe.db.sql(
+        """
+        SELECT name, channel, recipient, reference_doctype, reference_name, subject, message, attempts
+        FROM `tabNotification Outbox`
+        WHERE status = 'Pending'
+            AND (next_attempt_at IS NULL OR next_attempt_at <= %(now)s)
+        ORDER BY creation
+        LIMIT %(batch_size)s
+        FOR UPDATE SKIP LOCKED
+        """,
+        {"now": now, "batch_size": batch_size},
+        as_dict=True,
+    )
+    if not rows:
+        frappe.db.commit()
+        return 0
+    emails = dict(
+        frappe.get_all(
+            "User",
+            filters={"name": ["in", list({row.recipient for row in rows})]},
+            fields=["name", "email"],
+            as_list=True,
+        )
+    )
+    delivered = []
+    notifications = []
+    for row in rows:
+        recipient = emails.get(row.recipient)
+        if row.channel != "System" and recipient:
+            frappe.db.savepoint("notification_outbox")
+            try:
+                frappe.sendmail(
+                    recipients=[recipient],
+                    subject=row.subject,
+                    message=row.message,
+                    reference_doctype=row.reference_doctype if row.reference_name else None,
+                    reference_name=row.reference_name,
+                )
+            except Exception:
+                frappe.db.rollback(save_point="notification_outbox")
+                record_failure(row, frappe.get_traceback(), now)
+                continue
+        if row.channel != "Email":
+            notifications.append(
+                (row.recipient, row.subject, row.message, row.reference_doctype, row.reference_name)
+            )
+        delivered.append(row.name)
+    create_system_notifications(notifications)
+    if delivered:
+        frappe.db.sql(
+            """
+            UPDATE `tabNotification Outbox`
+            SET status = 'Sent', sent_on = %(now)s, attempts = attempts + 1, modified = %(now)s
+            WHERE name IN %(names)s
+            """,
+            {"now": now, "names": delivered},
+        )
+    frappe.db.commit()
+    return len(rows)
+
+
+def record_failure(row, error, now):
+    attempts = row.attempts + 1
+    frappe.db.set_value(
+        "Notification Outbox",
+        row.name,
+        {
+            "attempts": attempts,
+            "status": "Failed" if attempts >= MAX_ATTEMPTS else "Pending",
+            "next_attempt_at": add_to_date(now, minutes=RETRY_BASE_MINUTES * 2 ** (attempts - 1)),
+            "last_error": error,
+        },
+    )
+
+
+@frappe.whitelist()
+def requeue_failed_notifications():
+    frappe.only_for("System Manager")
+    frappe.db.sql(
+        """
+        UPDATE `tabNotification Outbox`
+        SET status = 'Pending', attempts = 0, next_attempt_at = NULL
+        WHERE status = 'Failed'
+        """
+    )
+
+
+def create_system_notifications(notifications):
+    """Bulk insert Notification Logs from (user, subject, message, reference_doctype, reference_name) tuples."""
+    if not notifications:
+        return
+    timestamp = now_datetime()
+    fields = [
+        "name", "creation", "modified", "owner", "modified_by",
+        "subject", "email_content", "for_user", "type",
+        "document_type", "document_name", "read",
+    ]
+    values = [
+        (
+            frappe.generate_hash(length=10), timestamp, timestamp,
+            frappe.session.user, frappe.session.user,
+            subject, message, user, "Alert",
+            reference_doctype if reference_name else None, reference_name, 0,
+        )
+        for user, subject, message, reference_doctype, reference_name in notifications
+    ]
+    frappe.db.bulk_insert("Notification Log", fields, values)
@@ -0,0 +1,121 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate, now_datetime
+
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.notification_outbox.notification_outbox import (
+	MAX_ATTEMPTS,
+	flush_outbox_batch,
+	queue_notifications,
+)
+from quantbit_pro_work_management.tasks import get_digest_notifications
+
+
+def make_due_document(name, owner, document_type, expiry_date="2026-11-01"):
+	return frappe._dict(
+		index_entry=f"Document Application::{name}",
+		reference_doctype="Document Application",
+		name=name,
+		owner=owner,
+		applicant=f"{name} Applicant",
+		document_type=document_type,
+		effective_expiry_date=getdate(expiry_date),
+		reminder_threshold=30,
+	)
+
+
+def make_notification(dedup_key, **kwargs):
+	return {
+		"dedup_key": dedup_key,
+		"event": "Expiry Reminder",
+		"channel": "Email",
+		"recipient": "Administrator",
+		"subject": "_Test Outbox",
+		"message": f"_Test Outbox message {dedup_key}",
+		**kwargs,
+	}
+
+
+class TestNotificationOutbox(FrappeTestCase):
+	def test_event_options_cover_queued_events(self):
+		options = frappe.get_meta("Notification Outbox").get_options("event").split("\n")
+		for event in ("Submitted", "Issued", "Expiry Reminder", "Expired", "Expiry Digest"):
+			self.assertIn(event, options)
+
+	def flush(self, sendmail_side_effect=None):
+		with (
+			patch("frappe.sendmail", side_effect=sendmail_side_effect) as sendmail,
+			patch.object(frappe.db, "commit"),
+		):
+			flush_outbox_batch(batch_size=10000)
+		return sendmail
+
+	def test_flush_sends_pending_rows(self):
+		queue_notifications([make_notification("_Test Outbox::sent")])
+		sendmail = self.flush()
+		self.assertIn(
+			"_Test Outbox message _Test Outbox::sent",
+			[call.kwargs["message"] for call in sendmail.call_args_list],
+		)
+		row = frappe.db.get_value(
+			"Notification Outbox", "_Test Outbox::sent", ["status", "attempts", "sent_on"], as_dict=True
+		)
+		self.assertEqual(row.status, "Sent")
+		self.assertEqual(row.attempts, 1)
+		self.assertTrue(row.sent_on)
+
+	def test_failed_email_is_retried_then_given_up(self):
+		queue_notifications([make_notification("_Test Outbox::failing")])
+		for attempt in range(1, MAX_ATTEMPTS + 1):
+			self.flush(sendmail_side_effect=Exception("_Test SMTP down"))
+			row = frappe.db.get_value(
+				"Notification Outbox",
+				"_Test Outbox::failing",
+				["status", "attempts", "next_attempt_at", "last_error"],
+				as_dict=True,
+			)
+			self.assertEqual(row.attempts, attempt)
+			self.assertIn("_Test SMTP down", row.last_error)
+			if attempt < MAX_ATTEMPTS:
+				self.assertEqual(row.status, "Pending")
+				self.assertGreater(row.next_attempt_at, now_datetime())
+				# not due again until the backoff has passed
+				self.flush(sendmail_side_effect=Exception("_Test SMTP down"))
+				self.assertEqual(frappe.db.get_value("Notification Outbox", "_Test Outbox::failing", "attempts"), attempt)
+				frappe.db.set_value("Notification Outbox", "_Test Outbox::failing", "next_attempt_at", None)
+		self.assertEqual(row.status, "Failed")
+
+	def test_duplicate_dedup_key_is_ignored(self):
+		queue_notifications([make_notification("_Test Outbox::dedup", message="first")])
+		queue_notifications([make_notification("_Test Outbox::dedup", message="second")])
+		self.assertEqual(frappe.db.count("Notification Outbox", {"dedup_key": "_Test Outbox::dedup"}), 1)
+		self.assertEqual(frappe.db.get_value("Notification Outbox", "_Test Outbox::dedup", "message"), "first")
+
+	def test_digest_groups_by_recipient_and_document_type(self):
+		due = [
+			make_due_document("_Test Digest 1", "_test_digest_a@example.com", "_Test Passport"),
+			make_due_document("_Test Digest 2", "_test_digest_a@example.com", "_Test Visa"),
+			make_due_document("_Test Digest 3", "_test_digest_b@example.com", "_Test Passport"),
+		]
+		expired = [
+			make_due_document("_Test Digest 4", "_test_digest_a@example.com", "_Test Visa", "2026-10-01")
+		]
+		notifications = get_digest_notifications(due, expired, getdate("2026-10-16"))
+
+		digests = {row["recipient"]: row for row in notifications if row["event"] == "Expiry Digest"}
+		self.assertEqual(set(digests), {"_test_digest_a@example.com", "_test_digest_b@example.com"})
+		message = digests["_test_digest_a@example.com"]["message"]
+		for name in ("_Test Digest 1", "_Test Digest 2", "_Test Digest 4"):
+			self.assertIn(name, message)
+		self.assertIn("_Test Passport", message)
+		self.assertIn("_Test Visa", message)
+		self.assertNotIn("_Test Digest 3", message)
+		self.assertIn("Expired documents", message)
+		self.assertNotIn("Expired documents", digests["_test_digest_b@example.com"]["message"])
+		# plus one system notification per document
+		system = [row for row in notifications if row["channel"] == "System"]
+		self.assertEqual(sorted(row["reference_name"] for row in system), [doc.name for doc in due + expired])
@@ -0,0 +1,19 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+
+class ProWorkProfileLog(Document):
+    @staticmethod
+    def clear_old_logs(days=30):
+        """Called by Log Settings, see default_log_clearing_doctypes in hooks.py."""
+        table = frappe.qb.DocType("Pro Work Profile Log")
+        frappe.db.delete(table, filters=(table.creation < (Now() - Interval(days=days))))
+
+
+def on_doctype_update():
+    frappe.db.add_index("Pro Work Profile Log", ["scope", "creation"])
@@ -0,0 +1,62 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from quantbit_pro_work_management.profiling import get_profile_metrics, profile
+
+TEST_SCOPE = "_Test Profile"
+
+
+class TestProWorkProfileLog(FrappeTestCase):
+	def setUp(self):
+		# is_profiling_enabled() reads this before the Pro Work Settings value
+		frappe.local.pro_work_profiling = True
+
+	def tearDown(self):
+		frappe.local.pro_work_profiling = None
+
+	def test_profile_records_queries_and_timings(self):
+		with profile(f"{TEST_SCOPE}.outer", "_Test Reference"):
+			frappe.db.sql("SELECT 1")
+			with profile(f"{TEST_SCOPE}.inner"):
+				frappe.db.sql("SELECT 1")
+				frappe.db.sql("SELECT 1")
+
+		# the counting wrapper lives on the instance only while a block is open
+		self.assertNotIn("sql", frappe.db.__dict__)
+		self.assertEqual(frappe.db.sql.__func__, type(frappe.db).sql)
+
+		logs = {
+			row.scope: row
+			for row in frappe.get_all(
+				"Pro Work Profile Log",
+				filters={"scope": ["like", f"{TEST_SCOPE}.%"]},
+				fields=["scope", "reference_name", "duration_ms", "query_count", "query_time_ms"],
+			)
+		}
+		self.assertEqual(set(logs), {f"{TEST_SCOPE}.outer", f"{TEST_SCOPE}.inner"})
+		# queries of the inner block count in the outer one too
+		self.assertEqual(logs[f"{TEST_SCOPE}.outer"].query_count, 3)
+		self.assertEqual(logs[f"{TEST_SCOPE}.inner"].query_count, 2)
+		self.assertEqual(logs[f"{TEST_SCOPE}.outer"].reference_name, "_Test Reference")
+		self.assertGreaterEqual(logs[f"{TEST_SCOPE}.outer"].duration_ms, logs[f"{TEST_SCOPE}.inner"].duration_ms)
+		self.assertGreater(logs[f"{TEST_SCOPE}.outer"].query_time_ms, 0)
+
+		metrics = {row.scope: row for row in get_profile_metrics(scope=TEST_SCOPE, hours=1)}
+		self.assertEqual(set(metrics), set(logs))
+		for scope, log in logs.items():
+			self.assertEqual(metrics[scope].calls, 1)
+			self.assertEqual(metrics[scope].max_queries, log.query_count)
+			self.assertEqual(metrics[scope].p95_queries, log.query_count)
+			self.assertAlmostEqual(float(metrics[scope].max_ms), float(log.duration_ms), places=3)
+
+	def test_profile_restores_sql_after_error(self):
+		with self.assertRaises(ZeroDivisionError), profile(f"{TEST_SCOPE}.error"):
+			frappe.db.sql("SELECT 1")
+			1 / 0
+		self.assertNotIn("sql", frappe.db.__dict__)
+		self.assertEqual(
+			frappe.db.get_value("Pro Work Profile Log", {"scope": f"{TEST_SCOPE}.error"}, "query_count"), 1
+		)
@@ -0,0 +1,16 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index import (
+    get_passport_reminder_days,
+    update_entry_reminder_dates,
+)
+
+
+class ProWorkSettings(Document):
+    def on_update(self):
+        if self.has_value_changed("passport_reminder_days"):
+            update_entry_reminder_dates(get_passport_reminder_days(self), reference_doctype="Applicant")
@@ -0,0 +1,101 @@
+// Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+// For license information, please see license.txt
+
+frappe.pages["expiry-forecast"].on_page_load = function(wrapper) {
+    const page = frappe.ui.make_app_page({
+        parent: wrapper,
+        title: __("Expiry Forecast"),
+        single_column: true
+    });
+    new ExpiryForecast(page);
+};
+
+class ExpiryForecast {
+    constructor(page) {
+        this.page = page;
+        this.days = page.add_field({
+            fieldname: "days",
+            label: __("Horizon (Days)"),
+            fieldtype: "Select",
+            options: "90\n180\n365",
+            default: "90",
+            change: () => this.refresh()
+        });
+        this.group_by = page.add_field({
+            fieldname: "group_by",
+            label: __("Group By"),
+            fieldtype: "Select",
+            options: "Day\nWeek",
+            default: "Week",
+            change: () => this.refresh()
+        });
+        this.document_type = page.add_field({
+            fieldname: "document_type",
+            label: __("Document Type"),
+            fieldtype: "Link",
+            options: "Document Type",
+            change: () => this.refresh()
+        });
+        this.$heatmap = $("<div class='expiry-forecast-heatmap'></div>").appendTo(page.main);
+        this.$table = $("<div class='expiry-forecast-table'></div>").appendTo(page.main);
+        this.refresh();
+    }
+
+    refresh() {
+        const filters = {
+            days: this.days.get_value(),
+            document_type: this.document_type.get_value()
+        };
+        const method = "quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_expiry_bucket.document_expiry_bucket.get_expiry_forecast";
+        // the heatmap always shows days; the table follows the Group By filter
+        frappe.call({ method, args: { ...filters, group_by: "Day" } }).then((r) => this.render_heatmap(r.message));
+        frappe.call({ method, args: { ...filters, group_by: this.group_by.get_value() } }).then((r) => this.render_table(r.message));
+    }
+
+    render_heatmap(forecast) {
+        const data_points = {};
+        for (const row of forecast.periods) {
+            const timestamp = String(frappe.datetime.str_to_obj(row.period).getTime() / 1000);
+            data_points[timestamp] = (data_points[timestamp] || 0) + row.count;
+        }
+        this.$heatmap.empty();
+        new frappe.Chart(this.$heatmap[0], {
+            type: "heatmap",
+            title: __("Applications expiring per day"),
+            countLabel: __("Expiring"),
+            discreteDomains: 1,
+            data: {
+                dataPoints: data_points,
+                start: frappe.datetime.str_to_obj(forecast.from_date),
+                end: frappe.datetime.str_to_obj(forecast.to_date)
+            }
+        });
+    }
+
+    render_table(forecast) {
+        const periods = [...new Set(forecast.periods.map((row) => row.period))];
+        const document_types = [...new Set(forecast.periods.map((row) => row.document_type))].sort();
+        const counts = {};
+        for (const row of forecast.periods) {
+            counts[`${row.period}|${row.document_type}`] = row.count;
+        }
+        if (!periods.length) {
+            this.$table.html(`<p class="text-muted">${__("No live applications expire in this period.")}</p>`);
+            return;
+        }
+        const header = document_types.map((name) => `<th>${frappe.utils.escape_html(name)}</th>`).join("");
+        const body = periods.map((period) => {
+            const cells = document_types.map((name) => `<td>${counts[`${period}|${name}`] || ""}</td>`).join("");
+            const total = document_types.reduce((sum, name) => sum + (counts[`${period}|${name}`] || 0), 0);
+            return `<tr><td>${frappe.datetime.str_to_user(period)}</td>${cells}<td><b>${total}</b></td></tr>`;
+        }).join("");
+        this.$table.html(`
+            <div class="table-responsive">
+                <table class="table table-bordered table-sm">
+                    <thead><tr><th>${__(this.group_by.get_value())}</th>${header}<th>${__("Total")}</th></tr></thead>
+                    <tbody>${body}</tbody>
+                </table>
+            </div>
+        `);
+    }
+}
@@ -3,6 +3,19 @@
 
 frappe.query_reports["Document Application Report"] = {
     filters: [
+        {
+            fieldname: "view",
+            label: __("View"),
+            fieldtype: "Select",
+            options: "Detail\nSummary",
+            default: "Detail"
+        },
+        {
+            fieldname: "include_archived",
+            label: __("Include Archived"),
+            fieldtype: "Check",
+            depends_on: "eval:doc.view != 'Summary'"
+        },
         {
             fieldname: "from_date",
             label: __("From Date"),
@@ -30,6 +43,48 @@ frappe.query_reports["Document Application Report"] = {
             fieldtype: "Select",
             options: "\nDraft\nSubmitted\nUnder Review\nWaiting Docs\nApproved\nRejected\nIssued\nActive\nRenewed\nExtended\nExpired\nCancelled"
         }
-    ]
-};
+    ],
 
+    after_datatable_render: function(datatable) {
+        // The server returns one page; fetch the next one when scrolled near the bottom.
+        const report = frappe.query_report;
+        const page_length = 500;
+        let loading = false;
+        let has_more = report.get_filter_value("view") !== "Summary"
+            && (report.data || []).length >= page_length;
+
+        $(datatable.bodyScrollable).off("scroll.load_more").on("scroll.load_more", function() {
+            const body = this;
+            if (loading || !has_more) {
+                return;
+            }
+            if (body.scrollTop + body.clientHeight < body.scrollHeight - 200) {
+                return;
+            }
+            const last = report.data[report.data.length - 1];
+            if (!last) {
+                return;
+            }
+            loading = true;
+            frappe.call({
+                method: "quantbit_pro_work_management.quantbit_pro_work_management.report.document_application_report.document_application_report.get_next_page",
+                args: {
+                    filters: report.get_filter_values(),
+                    after_posting_date: last.posting_date,
+                    after_name: last.name
+                },
+                callback: function(r) {
+                    const rows = r.message || [];
+                    has_more = rows.length >= page_length;
+                    if (rows.length) {
+                        report.data.push(...rows);
+                        datatable.appendRows(rows);
+                    }
+                },
+                always: function() {
+                    loading = false;
+                }
+            });
+        });
+    }
+};
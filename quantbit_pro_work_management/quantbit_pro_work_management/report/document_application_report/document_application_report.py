@@ -2,21 +2,53 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe.desk.query_report import get_report_doc
+from frappe.utils import get_first_day
 
+from quantbit_pro_work_management.name_search import get_name_search_condition
+from quantbit_pro_work_management.profiling import profiled
+
+PAGE_LENGTH = 500
+
+
+@profiled("Document Application Report")
 def execute(filters=None):
-    columns = get_columns()
+    filters = frappe._dict(filters or {})
+    if filters.get("view") == "Summary":
+        return get_summary_columns(), get_summary_data(filters)
+    columns = get_columns(filters)
     data = get_data(filters)
-    return columns, data
+    report_summary = [
+        {
+            "value": get_total_count(filters),
+            "label": "Total Applications",
+            "datatype": "Int",
+            "indicator": "Blue",
+        }
+    ]
+    return columns, data, None, None, report_summary
 
 
-def get_columns():
-    return [
+@frappe.whitelist()
+def get_next_page(filters, after_posting_date, after_name):
+    """Return the page of rows that follows (after_posting_date, after_name)."""
+    get_report_doc("Document Application Report")
+    filters = frappe._dict(frappe.parse_json(filters) or {})
+    return get_data(filters, after=(after_posting_date, after_name))
+
+
+def get_columns(filters=None):
+    if filters and filters.get("include_archived"):
+        # archived rows open the read-only Document Application Archive
+        name_column = {"fieldtype": "Dynamic Link", "options": "source_doctype"}
+    else:
+        name_column = {"fieldtype": "Link", "options": "Document Application"}
+    columns = [
         {
             "label": "Application ID",
             "fieldname": "name",
-            "fieldtype": "Link",
-            "options": "Document Application",
             "width": 180,
+            **name_column,
         },
         {
             "label": "Applicant Full Name",
@@ -57,9 +89,18 @@ def get_columns():
             "width": 120,
         },
     ]
+    if filters and filters.get("include_archived"):
+        columns.append({
+            "label": "Source",
+            "fieldname": "source_doctype",
+            "fieldtype": "Link",
+            "options": "DocType",
+            "width": 200,
+        })
+    return columns
 
 
-def get_data(filters):
+def get_conditions(filters, doctype="Document Application"):
     conditions = []
     values = {}
 
@@ -76,33 +117,170 @@ def get_data(filters):
         values["transaction_type"] = filters["transaction_type"]
 
     if filters.get("applicant_full_name"):
-        conditions.append("applicant_full_name LIKE %(applicant_full_name)s")
-        values["applicant_full_name"] = f"%{filters['applicant_full_name']}%"
+        condition, name_values = get_name_search_condition(doctype, filters["applicant_full_name"])
+        conditions.append(condition)
+        values.update(name_values)
 
     if filters.get("status"):
         conditions.append("status = %(status)s")
         values["status"] = filters["status"]
 
-    condition_query = ""
-    if conditions:
-        condition_query = "WHERE " + " AND ".join(conditions)
+    return conditions, values
+
+
+def get_source_tables(filters):
+    tables = ["Document Application"]
+    if filters.get("include_archived"):
+        # the archive is read with raw SQL, so its own read-only permission is checked here
+        frappe.has_permission("Document Application Archive", "read", throw=True)
+        tables.append("Document Application Archive")
+    return tables
+
+
+def get_total_count(filters):
+    total = 0
+    for doctype in get_source_tables(filters):
+        conditions, values = get_conditions(filters, doctype)
+        condition_query = "WHERE " + " AND ".join(conditions) if conditions else ""
+        total += frappe.db.sql(
+            f"""
+            SELECT COUNT(*)
+            FROM `tab{doctype}`
+            {condition_query}
+            """,
+            values,
+        )[0][0]
+    return total
+
+
+def get_data(filters, after=None, page_length=PAGE_LENGTH):
+    """One page of rows ordered by (posting_date, name) descending.
+
+    `after` is the (posting_date, name) of the last row already shown; seeking
+    past it keeps deep pages as cheap as the first one. With include_archived
+    each table returns its own page and the two are merged.
+    """
+    values = {"page_length": page_length}
+    queries = []
+    for doctype in get_source_tables(filters):
+        conditions, table_values = get_conditions(filters, doctype)
+        values.update(table_values)
+        if after:
+            conditions.append(
+                "(posting_date < %(after_posting_date)s"
+                " OR (posting_date = %(after_posting_date)s AND name < %(after_name)s))"
+            )
+            values["after_posting_date"], values["after_name"] = after
+        condition_query = "WHERE " + " AND ".join(conditions) if conditions else ""
+        queries.append(
+            f"""(
+                SELECT
+                    name,
+                    applicant_full_name,
+                    document_category,
+                    document_type,
+                    transaction_type,
+                    posting_date,
+                    status,
+                    '{doctype}' AS source_doctype
+                FROM
+                    `tab{doctype}`
+                {condition_query}
+                ORDER BY posting_date DESC, name DESC
+                LIMIT %(page_length)s
+            )"""
+        )
+    query = " UNION ALL ".join(queries)
+
+    return frappe.db.sql(
+        f"""
+        {query}
+        ORDER BY posting_date DESC, name DESC
+        LIMIT %(page_length)s
+        """,
+        values,
+        as_dict=True,
+    )
+
+
+def get_summary_columns():
+    return [
+        {
+            "label": "Month",
+            "fieldname": "month",
+            "fieldtype": "Date",
+            "width": 120,
+        },
+        {
+            "label": "Document Category",
+            "fieldname": "document_category",
+            "fieldtype": "Link",
+            "options": "Document Category",
+            "width": 160,
+        },
+        {
+            "label": "Document Type",
+            "fieldname": "document_type",
+            "fieldtype": "Link",
+            "options": "Document Type",
+            "width": 160,
+        },
+        {
+            "label": "Transaction Type",
+            "fieldname": "transaction_type",
+            "fieldtype": "Data",
+            "width": 140,
+        },
+        {
+            "label": "Status",
+            "fieldname": "status",
+            "fieldtype": "Data",
+            "width": 120,
+        },
+        {
+            "label": "Applications",
+            "fieldname": "application_count",
+            "fieldtype": "Int",
+            "width": 120,
+        },
+    ]
+
+
+def get_summary_data(filters):
+    """Monthly counts read from Document Application Rollup instead of the detail table."""
+    conditions = ["application_count != 0"]
+    values = {}
+
+    if filters.get("from_date"):
+        conditions.append("month >= %(from_month)s")
+        values["from_month"] = get_first_day(filters["from_date"])
+
+    if filters.get("to_date"):
+        conditions.append("month <= %(to_month)s")
+        values["to_month"] = get_first_day(filters["to_date"])
+
+    if filters.get("transaction_type"):
+        conditions.append("transaction_type = %(transaction_type)s")
+        values["transaction_type"] = filters["transaction_type"]
+
+    if filters.get("status"):
+        conditions.append("status = %(status)s")
+        values["status"] = filters["status"]
 
     return frappe.db.sql(
         f"""
         SELECT
-            name,
-            applicant_full_name,
+            month,
             document_category,
             document_type,
             transaction_type,
-            posting_date,
-            status
+            status,
+            application_count
         FROM
-            `tabDocument Application`
-        {condition_query}
-        ORDER BY posting_date DESC
+            `tabDocument Application Rollup`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY month DESC, document_category, document_type, transaction_type, status
         """,
         values,
         as_dict=True,
     )
-
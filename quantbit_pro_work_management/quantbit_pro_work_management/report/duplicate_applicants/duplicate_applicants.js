@@ -0,0 +1,13 @@
+// Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Duplicate Applicants"] = {
+    filters: [
+        {
+            fieldname: "identity_key",
+            label: __("Matched On"),
+            fieldtype: "Select",
+            options: "\nPassport No\nNational ID\nEmail\nMobile"
+        }
+    ]
+};
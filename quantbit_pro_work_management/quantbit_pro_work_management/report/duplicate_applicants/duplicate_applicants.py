@@ -0,0 +1,61 @@
+# Copyright (c) 2026, Quantbit Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.applicant.applicant import (
+    IDENTITY_KEYS,
+)
+
+
+def execute(filters=None):
+    """Groups of applicants sharing a normalized identity key, as candidate merges.
+
+    A prepared report: the scan runs in a background job and the result is
+    stored. Each key is grouped on its own index; the oldest applicant of a
+    group is suggested as the one to keep.
+    """
+    filters = frappe._dict(filters or {})
+    return get_columns(), get_data(filters)
+
+
+def get_columns():
+    return [
+        {"label": "Matched On", "fieldname": "identity_key", "fieldtype": "Data", "width": 120},
+        {"label": "Value", "fieldname": "value", "fieldtype": "Data", "width": 200},
+        {"label": "Applicants", "fieldname": "applicant_count", "fieldtype": "Int", "width": 100},
+        {"label": "Keep", "fieldname": "keep", "fieldtype": "Link", "options": "Applicant", "width": 160},
+        {"label": "Merge", "fieldname": "merge", "fieldtype": "Small Text", "width": 260},
+        {"label": "Full Names", "fieldname": "full_names", "fieldtype": "Small Text", "width": 300},
+    ]
+
+
+def get_data(filters):
+    data = []
+    for fieldname, (_source, label) in IDENTITY_KEYS.items():
+        if filters.identity_key and filters.identity_key != label:
+            continue
+        for row in frappe.db.sql(
+            f"""
+            SELECT `{fieldname}` AS value,
+                COUNT(*) AS applicant_count,
+                GROUP_CONCAT(name ORDER BY creation, name SEPARATOR '\n') AS names,
+                GROUP_CONCAT(IFNULL(full_name, '') ORDER BY creation, name SEPARATOR '\n') AS full_names
+            FROM `tabApplicant`
+            WHERE `{fieldname}` IS NOT NULL AND `{fieldname}` != ''
+            GROUP BY `{fieldname}`
+            HAVING COUNT(*) > 1
+            ORDER BY applicant_count DESC, value
+            """,
+            as_dict=True,
+        ):
+            keep, *merge = row.names.split("\n")
+            data.append({
+                "identity_key": label,
+                "value": row.value,
+                "applicant_count": row.applicant_count,
+                "keep": keep,
+                "merge": "\n".join(merge),
+                "full_names": row.full_names,
+            })
+    return data
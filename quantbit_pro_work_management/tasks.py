@@ -1,107 +1,497 @@
+import time
+
 import frappe
-from frappe.utils import getdate, nowdate, add_days
+from frappe.utils import add_days, date_diff, escape_html, getdate, now_datetime, nowdate
+
+from quantbit_pro_work_management.profiling import profile
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.document_application.document_application import (
+    AggregateDeltas,
+    get_effective_expiry_date,
+    set_status_in_bulk,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.expiry_index.expiry_index import (
+    get_reminder_thresholds,
+)
+from quantbit_pro_work_management.quantbit_pro_work_management.doctype.notification_outbox.notification_outbox import (
+    queue_notifications,
+)
+
+EXPIRY_CHUNK_SIZE = 500
 
 def check_document_expiry_notifications():
+    """Coordinator: plan (or resume) today's Expiry Job Run and fan it out to the long queue."""
     today = getdate(nowdate())
-    documents = frappe.get_all(
-        "Document Application",
-        filters={
-            "status": ["in", ["Active", "Issued"]]
+    job_run = frappe.db.get_value(
+        "Expiry Job Run",
+        {"run_date": today},
+        ["name", "status"],
+        as_dict=True,
+        order_by="creation desc",
+    )
+    if job_run and job_run.status == "Completed":
+        return
+    enqueue_expiry_chunks(job_run.name if job_run else create_expiry_job_run(today))
+
+@frappe.whitelist()
+def resume_expiry_job_run(job_run):
+    frappe.only_for("System Manager")
+    enqueue_expiry_chunks(job_run)
+
+def create_expiry_job_run(today):
+    """Split today's due set into (owner, name) ranges of at most EXPIRY_CHUNK_SIZE entries.
+
+    Each chunk runs from its own start up to the next chunk's start, the
+    first from the beginning and the last to the end, so an entry that
+    becomes due after planning still falls into exactly one chunk.
+    """
+    boundaries = frappe.db.sql(
+        """
+        SELECT owner, name, total
+        FROM (
+            SELECT owner, name,
+                ROW_NUMBER() OVER (ORDER BY owner, name) AS row_no,
+                COUNT(*) OVER () AS total
+            FROM `tabExpiry Index`
+            WHERE due_date <= %(today)s
+        ) due
+        WHERE MOD(row_no - 1, %(chunk_size)s) = 0
+        ORDER BY owner, name
+        """,
+        {"today": today, "chunk_size": EXPIRY_CHUNK_SIZE},
+    )
+    job_run = frappe.new_doc("Expiry Job Run")
+    job_run.run_date = today
+    job_run.total_documents = boundaries[0][2] if boundaries else 0
+    for i, (owner, name, total) in enumerate(boundaries):
+        next_owner, next_name = boundaries[i + 1][:2] if i + 1 < len(boundaries) else ("", "")
+        job_run.append("chunks", {
+            "from_owner": owner if i else "",
+            "from_name": name if i else "",
+            "to_owner": next_owner,
+            "to_name": next_name,
+            "document_count": min(EXPIRY_CHUNK_SIZE, total - i * EXPIRY_CHUNK_SIZE),
+        })
+    if not job_run.chunks:
+        job_run.status = "Completed"
+    job_run.insert(ignore_permissions=True)
+    frappe.db.commit()
+    return job_run.name
+
+def enqueue_expiry_chunks(job_run):
+    chunks = frappe.get_all(
+        "Expiry Job Run Chunk",
+        filters={"parent": job_run, "parenttype": "Expiry Job Run", "status": ["!=", "Completed"]},
+        pluck="name",
+    )
+    if not chunks:
+        return
+    frappe.db.set_value(
+        "Expiry Job Run Chunk", {"name": ["in", chunks]}, "status", "Queued", update_modified=False
+    )
+    frappe.db.set_value("Expiry Job Run", job_run, "status", "Running")
+    frappe.db.commit()
+    for chunk in chunks:
+        frappe.enqueue(
+            "quantbit_pro_work_management.tasks.process_expiry_chunk",
+            queue="long",
+            job_id=f"expiry_chunk::{chunk}",
+            deduplicate=True,
+            job_run=job_run,
+            chunk=chunk,
+        )
+
+def process_expiry_chunk(job_run, chunk):
+    """Worker: process one (owner, name) range in a single transaction and checkpoint it.
+
+    Runs against the run's own date, so a run resumed on a later day still
+    processes the set it was planned for.
+    """
+    row = frappe.db.get_value(
+        "Expiry Job Run Chunk",
+        chunk,
+        ["from_owner", "from_name", "to_owner", "to_name", "status"],
+        as_dict=True,
+    )
+    if not row or row.status == "Completed":
+        return
+    try:
+        # the rollup and bucket rows are shared by all chunks: written last, locked only until the commit
+        aggregate_deltas = AggregateDeltas()
+        summary = process_due_documents(
+            getdate(frappe.db.get_value("Expiry Job Run", job_run, "run_date")),
+            key_range=((row.from_owner or "", row.from_name or ""), (row.to_owner or "", row.to_name or "")),
+            commit=False,
+            aggregate_deltas=aggregate_deltas,
+        )
+        aggregate_deltas.apply()
+        frappe.db.set_value(
+            "Expiry Job Run Chunk",
+            chunk,
+            {
+                "status": "Completed",
+                "expired": summary["expired"],
+                "reminded": summary["reminded"],
+                "error": None,
+            },
+            update_modified=False,
+        )
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        frappe.db.set_value(
+            "Expiry Job Run Chunk",
+            chunk,
+            {"status": "Failed", "error": frappe.get_traceback()},
+            update_modified=False,
+        )
+        frappe.db.commit()
+    update_job_run_status(job_run)
+
+def update_job_run_status(job_run):
+    counts = frappe.db.sql(
+        """
+        SELECT status, COUNT(*) AS chunks, SUM(expired) AS expired, SUM(reminded) AS reminded
+        FROM `tabExpiry Job Run Chunk`
+        WHERE parent = %s AND parenttype = 'Expiry Job Run'
+        GROUP BY status
+        """,
+        job_run,
+        as_dict=True,
+    )
+    by_status = {row.status: row for row in counts}
+    if set(by_status) <= {"Completed"}:
+        status = "Completed"
+    elif set(by_status) <= {"Completed", "Failed"}:
+        status = "Failed"
+    else:
+        status = "Running"
+    frappe.db.set_value(
+        "Expiry Job Run",
+        job_run,
+        {
+            "status": status,
+            "expired": sum(row.expired or 0 for row in counts),
+            "reminded": sum(row.reminded or 0 for row in counts),
         },
-        fields=[
-            "name",
-            "expiry_date",
-            "new_expiry_date",
-            "extended_date",
-            "transaction_type",
-            "document_type",
-            "applicant",
-            "owner"
-        ]
     )
+    frappe.db.commit()
+
+def process_due_documents(today, key_range=None, commit=True, aggregate_deltas=None):
+    """Expire and notify everything in the Expiry Index that is due on `today`.
+
+    One range scan on due_date covers live applications, their supporting
+    documents and applicant passports; only applications change status.
+    `key_range` is ((from_owner, from_name), (to_owner, to_name)), the end
+    exclusive and an empty end meaning no upper bound. With `aggregate_deltas`
+    the rollup and bucket changes are collected there, see set_status_in_bulk.
+    """
+    conditions = ["due_date <= %(today)s"]
+    values = {"today": today}
+    if key_range:
+        (values["from_owner"], values["from_name"]), (values["to_owner"], values["to_name"]) = key_range
+        conditions.append("(owner, name) >= (%(from_owner)s, %(from_name)s)")
+        if values["to_owner"] or values["to_name"]:
+            conditions.append("(owner, name) < (%(to_owner)s, %(to_name)s)")
+    with profile("Expiry Job.scan"):
+        documents = frappe.db.sql(
+            f"""
+            SELECT name AS index_entry, reference_doctype, reference_name AS name, parent_document,
+                expiry_date AS effective_expiry_date, document_type, applicant, owner
+            FROM `tabExpiry Index`
+            WHERE {" AND ".join(conditions)}
+            """,
+            values,
+            as_dict=True,
+        )
+    due_documents, expired_documents = [], []
     for doc in documents:
-        expiry_date = get_effective_expiry_date(doc)
-        if not expiry_date:
-            continue
-        expiry_date = getdate(expiry_date)
-        if expiry_date < today:
-            mark_document_expired(doc.name)
-            send_expired_notification(doc, expiry_date)
-            continue
-        doc_type = frappe.get_doc("Document Type", doc.document_type)
-        if not doc_type.reminder_days_before_expiry:
-            continue
-        reminder_date = add_days(
-            expiry_date,
-            -doc_type.reminder_days_before_expiry
+        doc.effective_expiry_date = getdate(doc.effective_expiry_date)
+        if doc.effective_expiry_date < today:
+            expired_documents.append(doc)
+        else:
+            due_documents.append(doc)
+    with profile("Expiry Job.expire"):
+        summary = expire_documents(
+            [doc.name for doc in expired_documents if doc.reference_doctype == "Document Application"],
+            commit=commit,
+            aggregate_deltas=aggregate_deltas,
         )
-        if reminder_date <= today:
-            send_expiry_reminder(doc, expiry_date)
-
-def get_effective_expiry_date(doc):
-    if doc.transaction_type == "Renewal":
-        return doc.new_expiry_date
-    elif doc.transaction_type == "Extension":
-        return doc.extended_date
-    return doc.expiry_date
-
-def mark_document_expired(docname):
-    document = frappe.get_doc("Document Application", docname)
-    if document.status != "Expired":
-        document.status = "Expired"
-        document.save(ignore_permissions=True)
-
-def send_expiry_reminder(doc, expiry_date):
-    recipient = frappe.db.get_value("User", doc.owner, "email")
-    if not recipient:
+        summary["expired"] += close_expired_entries(expired_documents)
+    with profile("Expiry Job.remind"):
+        due_documents = filter_unsent_reminders(due_documents, today)
+    with profile("Expiry Job.notify"):
+        queue_expiry_notifications(due_documents, expired_documents, today)
+    summary["reminded"] = len(due_documents)
+    return summary
+
+def close_expired_entries(documents):
+    """Take expired index entries out of the daily scan and return how many were not applications.
+
+    Applications that expired have already left the index through
+    set_status_in_bulk; passports and supporting documents stay listed
+    without a due date until their document is renewed.
+    """
+    if not documents:
+        return 0
+    frappe.db.sql(
+        """
+        UPDATE `tabExpiry Index`
+        SET due_date = NULL
+        WHERE name IN %(names)s
+        """,
+        {"names": [doc.index_entry for doc in documents]},
+    )
+    return sum(1 for doc in documents if doc.reference_doctype != "Document Application")
+
+def filter_unsent_reminders(documents, today):
+    """Return the documents whose current reminder threshold has not been sent yet.
+
+    Every due document moves its next_reminder_date on to the next (smaller)
+    threshold. Applications also get a ledger row per (document, threshold)
+    for the ones returned, so they are reminded once per threshold; for the
+    other sources the outbox dedup key does the same.
+    """
+    for doc in documents:
+        doc.reminder_threshold = get_current_reminder_threshold(doc, today)
+    advance_next_reminder_dates(documents)
+    documents = [doc for doc in documents if doc.reminder_threshold]
+    if not documents:
+        return []
+    applications = [doc for doc in documents if doc.reference_doctype == "Document Application"]
+    sent = set(
+        frappe.get_all(
+            "Document Reminder Ledger",
+            filters={"name": ["in", [get_ledger_name(doc) for doc in applications]]},
+            pluck="name",
+        )
+    ) if applications else set()
+    unsent = [
+        doc for doc in documents
+        if doc.reference_doctype != "Document Application" or get_ledger_name(doc) not in sent
+    ]
+    record_reminder_ledger([doc for doc in unsent if doc.reference_doctype == "Document Application"], today)
+    return unsent
+
+def get_current_reminder_threshold(doc, today):
+    days_remaining = date_diff(doc.effective_expiry_date, today)
+    thresholds = [
+        t for t in get_reminder_thresholds(doc.reference_doctype, doc.document_type) if t >= days_remaining
+    ]
+    return thresholds[-1] if thresholds else None
+
+def get_ledger_name(doc):
+    return f"{doc.name}::{doc.reminder_threshold}"
+
+def record_reminder_ledger(documents, today):
+    if not documents:
         return
-    frappe.sendmail(
-        recipients=[recipient],
-        subject="Document Expiry Reminder",
-        message=f"""
+    timestamp = now_datetime()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Document Reminder Ledger",
+        [
+            "name", "creation", "modified", "owner", "modified_by",
+            "document_application", "threshold_days", "effective_expiry_date", "sent_on",
+        ],
+        [
+            (
+                get_ledger_name(doc), timestamp, timestamp, user, user,
+                doc.name, doc.reminder_threshold, doc.effective_expiry_date, today,
+            )
+            for doc in documents
+        ],
+        ignore_duplicates=True,
+    )
+
+def advance_next_reminder_dates(documents):
+    """Point next_reminder_date at the next smaller threshold (or clear it).
+
+    The index entry is then due on that date, or the day after expiry when no
+    threshold is left.
+    """
+    documents_by_date = {}
+    for doc in documents:
+        thresholds = get_reminder_thresholds(doc.reference_doctype, doc.document_type)
+        smaller = [t for t in thresholds if doc.reminder_threshold and t < doc.reminder_threshold]
+        next_date = add_days(doc.effective_expiry_date, -smaller[0]) if smaller else None
+        documents_by_date.setdefault(next_date, []).append(doc)
+    for next_date, docs in documents_by_date.items():
+        frappe.db.sql(
+            """
+            UPDATE `tabExpiry Index`
+            SET next_reminder_date = %(next_date)s,
+                due_date = IFNULL(%(next_date)s, DATE_ADD(expiry_date, INTERVAL 1 DAY))
+            WHERE name IN %(names)s
+            """,
+            {"next_date": next_date, "names": [doc.index_entry for doc in docs]},
+        )
+        applications = [doc.name for doc in docs if doc.reference_doctype == "Document Application"]
+        if applications:
+            frappe.db.sql(
+                """
+                UPDATE `tabDocument Application`
+                SET next_reminder_date = %(next_date)s
+                WHERE name IN %(names)s
+                """,
+                {"next_date": next_date, "names": applications},
+            )
+
+def get_notification_mode():
+    return (
+        frappe.db.get_single_value("Pro Work Settings", "expiry_notification_mode")
+        or "Per Document"
+    )
+
+def expire_documents(docnames, chunk_size=500, commit=True, aggregate_deltas=None):
+    """Move Active / Issued documents to Expired with set-based updates.
+
+    Each chunk is updated, versioned and (unless `commit` is off, e.g. inside a
+    job chunk that owns its transaction) committed on its own, so the lifecycle
+    hooks of a full save are skipped and locks are only held briefly.
+    """
+    start = time.monotonic()
+    expired = 0
+    chunks = 0
+    for i in range(0, len(docnames), chunk_size):
+        expired += len(
+            set_status_in_bulk(docnames[i : i + chunk_size], "Expired", aggregate_deltas=aggregate_deltas)
+        )
+        if commit:
+            frappe.db.commit()
+        chunks += 1
+    return {
+        "expired": expired,
+        "skipped": len(docnames) - expired,
+        "chunks": chunks,
+        "elapsed": round(time.monotonic() - start, 3),
+    }
+
+def queue_expiry_notifications(due_documents, expired_documents, today):
+    """Write the reminders and expiry alerts to the Notification Outbox.
+
+    They are queued in the chunk's transaction, so they are delivered only if
+    the status changes commit; flush_outbox sends them.
+    """
+    if get_notification_mode() == "Daily Digest":
+        notifications = get_digest_notifications(due_documents, expired_documents, today)
+    else:
+        notifications = [
+            get_expiry_notification(doc, True, "Email and System", get_expired_message(doc))
+            for doc in expired_documents
+        ] + [
+            get_expiry_notification(doc, False, "Email and System", get_expiry_reminder_message(doc))
+            for doc in due_documents
+        ]
+    queue_notifications(notifications)
+
+def get_expiry_notification(doc, expired, channel, message):
+    # applications keep their original keys; other sources are prefixed with their doctype
+    key = doc.name if doc.reference_doctype == "Document Application" else f"{doc.reference_doctype}::{doc.name}"
+    if expired:
+        notification = {
+            "dedup_key": f"Expired::{key}::{doc.effective_expiry_date}",
+            "event": "Expired",
+            "subject": "Document Expired",
+        }
+    else:
+        notification = {
+            "dedup_key": f"Expiry Reminder::{key}::{doc.effective_expiry_date}::{doc.reminder_threshold}",
+            "event": "Expiry Reminder",
+            "subject": "Document Expiry Reminder",
+        }
+    # supporting documents are child rows, so the notification opens their application
+    if doc.reference_doctype == "Supporting Document":
+        reference_doctype, reference_name = "Document Application", doc.parent_document
+    else:
+        reference_doctype, reference_name = doc.reference_doctype, doc.name
+    notification.update({
+        "channel": channel,
+        "recipient": doc.owner,
+        "reference_doctype": reference_doctype,
+        "reference_name": reference_name,
+        "message": message,
+    })
+    return notification
+
+def get_document_label(doc):
+    """HTML-escaped, as it goes into notification messages."""
+    if doc.reference_doctype == "Applicant":
+        label = f"Passport of {doc.applicant}"
+    elif doc.reference_doctype == "Supporting Document":
+        label = f"{doc.document_type} of {doc.parent_document}"
+    else:
+        label = doc.name
+    return escape_html(label)
+
+def get_expiry_reminder_message(doc):
+    return f"""
         <b>Reminder:</b><br><br>
-        Document: {doc.name}<br>
-        Applicant: {doc.applicant}<br>
-        Expiry Date: {expiry_date}<br><br>
+        Document: {get_document_label(doc)}<br>
+        Applicant: {escape_html(doc.applicant or '')}<br>
+        Expiry Date: {doc.effective_expiry_date}<br><br>
         Please initiate renewal or extension process.
         """
-    )
-    create_system_notification(
-        user=doc.owner,
-        subject="Document Expiry Reminder",
-        message=f"Document {doc.name} is expiring on {expiry_date}",
-        reference_name=doc.name
-    )
 
-def send_expired_notification(doc, expiry_date):
-    recipient = frappe.db.get_value("User", doc.owner, "email")
-    if not recipient:
-        return
-    frappe.sendmail(
-        recipients=[recipient],
-        subject="Document Expired",
-        message=f"""
+def get_expired_message(doc):
+    return f"""
         <b>Alert:</b><br><br>
-        Document: {doc.name}<br>
-        Applicant: {doc.applicant}<br>
-        Expired On: {expiry_date}<br><br>
+        Document: {get_document_label(doc)}<br>
+        Applicant: {escape_html(doc.applicant or '')}<br>
+        Expired On: {doc.effective_expiry_date}<br><br>
         Immediate action required.
         """
+
+def get_digest_notifications(due_documents, expired_documents, today):
+    """One digest email per owner plus a system notification per document."""
+    documents_by_owner = {}
+    for doc in due_documents:
+        documents_by_owner.setdefault(doc.owner, {"due": [], "expired": []})["due"].append(doc)
+    for doc in expired_documents:
+        documents_by_owner.setdefault(doc.owner, {"due": [], "expired": []})["expired"].append(doc)
+    notifications = []
+    for owner, documents in documents_by_owner.items():
+        # an owner's entries can span two chunks; each chunk sends its own digest
+        first_entry = min(doc.index_entry for doc in documents["due"] + documents["expired"])
+        notifications.append({
+            "dedup_key": f"Expiry Digest::{owner}::{today}::{first_entry}",
+            "event": "Expiry Digest",
+            "channel": "Email",
+            "recipient": owner,
+            "subject": "Document Expiry Digest",
+            "message": get_digest_message(documents["due"], documents["expired"]),
+        })
+        for doc in documents["due"]:
+            notifications.append(get_expiry_notification(
+                doc, False, "System", f"Document {get_document_label(doc)} is expiring on {doc.effective_expiry_date}"
+            ))
+        for doc in documents["expired"]:
+            notifications.append(get_expiry_notification(
+                doc, True, "System", f"Document {get_document_label(doc)} expired on {doc.effective_expiry_date}"
+            ))
+    return notifications
+
+def get_digest_message(due_documents, expired_documents):
+    sections = []
+    if expired_documents:
+        sections.append(
+            "<b>Expired documents - immediate action required:</b><br>"
+            + get_digest_table(expired_documents, "Expired On")
+        )
+    if due_documents:
+        sections.append(
+            "<b>Documents due for renewal or extension:</b><br>"
+            + get_digest_table(due_documents, "Expiry Date")
+        )
+    return "<br><br>".join(sections)
+
+def get_digest_table(documents, date_label):
+    rows = "".join(
+        f"<tr><td>{get_document_label(doc)}</td><td>{escape_html(doc.applicant or '')}</td>"
+        f"<td>{escape_html(doc.document_type or '')}</td><td>{doc.effective_expiry_date}</td></tr>"
+        for doc in documents
     )
-    create_system_notification(
-        user=doc.owner,
-        subject="Document Expired",
-        message=f"Document {doc.name} expired on {expiry_date}",
-        reference_name=doc.name
+    return (
+        '<table border="1" cellpadding="4" cellspacing="0">'
+        f"<tr><th>Document</th><th>Applicant</th><th>Document Type</th><th>{date_label}</th></tr>"
+        f"{rows}</table>"
     )
-
-def create_system_notification(user, subject, message, reference_name):
-    frappe.get_doc({
-        "doctype": "Notification Log",
-        "subject": subject,
-        "email_content": message,
-        "for_user": user,
-        "type": "Alert",
-        "document_type": "Document Application",
-        "document_name": reference_name
-    }).insert(ignore_permissions=True)
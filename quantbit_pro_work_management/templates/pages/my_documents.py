@@ -0,0 +1,15 @@
+import frappe
+from frappe import _
+
+from quantbit_pro_work_management.portal import get_portal_documents, get_user_applicants
+
+no_cache = 1
+
+
+def get_context(context):
+    if frappe.session.user == "Guest":
+        frappe.local.flags.redirect_location = "/login?redirect-to=/my-documents"
+        raise frappe.Redirect
+    context.title = _("My Documents")
+    context.show_sidebar = True
+    context.applicants = [get_portal_documents(applicant) for applicant in get_user_applicants(frappe.session.user)]